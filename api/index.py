@@ -8,9 +8,20 @@ import os
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.main import app
 
-# Vercel expects the handler to be the ASGI application
-# FastAPI is an ASGI application, so we can export it directly
-handler = app
+def _create_handler():
+    """
+    Builds the ASGI handler once during the init phase.
 
+    Importing app.main (FastAPI, pydantic, supabase, openai) dominates cold
+    start, so it happens inside this factory which runs exactly once at
+    module import - Vercel's init phase gets a CPU boost, making this the
+    cheapest place to pay the import cost.
+    """
+    from app.main import app
+    return app
+
+
+# Vercel expects the handler to be the ASGI application.
+# FastAPI is an ASGI application, so we can export it directly.
+handler = _create_handler()
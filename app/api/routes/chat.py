@@ -1,67 +1,124 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Header, Request
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from app.core.security import get_admin_token
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Any, Optional
 from app.core.config import settings
 from app.services.chat_service import ChatService
-from app.db.supabase import get_chatbot_supabase_client
+from app.db.audit_repo import AuditRepo
+from app.db import async_supabase
+from app.utils.background import fire_and_forget
+from app.utils.ttl_cache import TTLCache
+import httpx
 import logging
-import uuid
 
 # Define Router
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Optional rate limiting decorator
-# Applied only if ENABLE_RATE_LIMITING=true and slowapi is installed
+# Process-local session cache: consecutive turns on the same session skip the
+# admin_sessions lookup for up to 60s. Invalidated by session end (session.py).
+_session_cache = TTLCache(maxsize=10000, ttl=60)
+
+# Temp sessions (not persisted) are tagged by this id prefix.
+_TEMP_PREFIX = "temp-"
+_TEMP_PREFIX_LEN = len(_TEMP_PREFIX)
+
+# Module-level service singletons (lazy) - constructed once per warm process
+# so each request reuses the same repos/Supabase client instead of rebuilding them.
+_chat_service: Optional[ChatService] = None
+_audit_repo: Optional[AuditRepo] = None
+_session_service = None
+
+
+def _get_chat_service() -> ChatService:
+    global _chat_service
+    if _chat_service is None:
+        _chat_service = ChatService()
+    return _chat_service
+
+
+def _get_session_service():
+    global _session_service
+    if _session_service is None:
+        from app.services.session_service import SessionService
+        _session_service = SessionService()
+    return _session_service
+
+
+def _get_audit_repo() -> AuditRepo:
+    global _audit_repo
+    if _audit_repo is None:
+        _audit_repo = AuditRepo()
+    return _audit_repo
+
+# Optional rate limiter, built once at import. Decorators run at import time,
+# so the slowapi ImportError path is probed once here instead of inside every
+# decorated function. app.main reuses this instance for app.state.limiter.
+_limiter = None
+if settings.ENABLE_RATE_LIMITING:
+    try:
+        from slowapi import Limiter
+        from slowapi.util import get_remote_address
+        _limiter = Limiter(key_func=get_remote_address)
+    except ImportError:
+        pass
+
+
 def apply_rate_limit(func):
     """Apply rate limiting decorator if enabled."""
-    if settings.ENABLE_RATE_LIMITING:
-        try:
-            # Import here to avoid errors if slowapi not installed
-            from slowapi import Limiter
-            from slowapi.util import get_remote_address
-            limiter = Limiter(key_func=get_remote_address)
-            return limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")(func)
-        except ImportError:
-            pass
+    if _limiter is not None:
+        return _limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")(func)
     return func
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     message: str
     session_id: str
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     response: str
     session_id: str
 
-def get_or_create_session(session_id: str) -> Dict[str, Any]:
+async def get_or_create_session(session_id: str) -> Dict[str, Any]:
     """
     Gets existing session or creates a new one if it doesn't exist.
     No authentication required.
+    Session lookup goes through the async PostgREST client so the event
+    loop is not blocked while waiting on Supabase.
     """
-    supabase = get_chatbot_supabase_client()
-    
-    # Try to get existing session (only if it's not a temp session)
-    if not session_id.startswith('temp-'):
+    # Try to get existing session (only if it's not a temp session).
+    # Slice compare against the hoisted prefix avoids re-interning the
+    # literal and the method lookup on every request.
+    if session_id[:_TEMP_PREFIX_LEN] != _TEMP_PREFIX:
+        cached = _session_cache.get(session_id)
+        if cached is not None:
+            return cached
+
         try:
-            response = (
-                supabase.table("admin_sessions")
-                .select("session_id, admin_id, status")
-                .eq("session_id", session_id)
-                .single()
-                .execute()
+            rows = await async_supabase.select_rows(
+                "admin_sessions",
+                {
+                    "select": "session_id,admin_id,status",
+                    "session_id": f"eq.{session_id}",
+                    "limit": "1",
+                },
             )
-            
-            if response.data and response.data["status"] == "active":
-                return response.data
-        except Exception as e:
+        except httpx.HTTPError as e:
+            # Genuine transport/HTTP errors only - "no such session" comes
+            # back as an empty list, not an exception, so the normal
+            # create-new path below stays exception-free.
             logger.warning(f"Session lookup failed: {e}, creating new session")
-    
+            rows = []
+
+        if rows and rows[0]["status"] == "active":
+            _session_cache.set(session_id, rows[0])
+            return rows[0]
+
     # Session doesn't exist or is inactive, create new one
-    from app.services.session_service import SessionService
-    service = SessionService()
-    session_data = service.create_session("anonymous")
+    session_data = _get_session_service().create_session("anonymous")
+    _session_cache.set(session_data["session_id"], session_data)
     return session_data
 
 @router.post("/message", response_model=ChatResponse)
@@ -77,32 +134,37 @@ async def chat_message(
     """
     try:
         # Get or create session (no auth required)
-        session_data = get_or_create_session(request.session_id)
+        session_data = await get_or_create_session(request.session_id)
         
         # Use the actual session_id from the created/retrieved session
         actual_session_id = session_data["session_id"]
         
-        service = ChatService()
+        service = _get_chat_service()
         response_text = await service.process_user_message(
             session_id=actual_session_id,
             user_message=request.message,
             session_data=session_data
         )
         
-        return ChatResponse(response=response_text, session_id=actual_session_id)
+        # Both fields come from trusted service output, so skip Pydantic
+        # re-validation on the way out.
+        return ChatResponse.model_construct(response=response_text, session_id=actual_session_id)
 
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}", exc_info=True)
+        # logger.exception formats the traceback lazily via the logging
+        # machinery instead of an eager f-string + exc_info capture.
+        logger.exception("Error in chat endpoint")
         # Audit log endpoint error
         try:
-            from app.db.audit_repo import AuditRepo
-            audit = AuditRepo()
-            audit.log_action(
+            # Fire-and-forget: raising HTTPException must not wait on (or be
+            # masked by) the audit write.
+            audit = _get_audit_repo()
+            fire_and_forget(audit.log_action_async(
                 admin_id=session_data.get("admin_id", "unknown") if 'session_data' in locals() else "unknown",
                 action="chat_endpoint_error",
                 details={"error": str(e), "message": request.message[:100]},
                 session_id=session_data.get("session_id") if 'session_data' in locals() else None
-            )
+            ))
         except:
             pass
         raise HTTPException(status_code=500, detail=str(e))
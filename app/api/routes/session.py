@@ -1,25 +1,43 @@
-from fastapi import APIRouter, HTTPException, Header, Depends, status
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
 from app.services.session_service import SessionService
-from app.core.security import get_admin_token
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Built once per warm process: SessionService.__init__ grabs a Supabase
+# client, so constructing it per request is wasted work.
+_session_service: Optional[SessionService] = None
+
+
+def _get_session_service() -> SessionService:
+    global _session_service
+    if _session_service is None:
+        _session_service = SessionService()
+    return _session_service
+
 class StartSessionRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     admin_id: Optional[str] = "anonymous"
 
 class StartSessionResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     session_id: str
     status: str
     created_at: str
 
 class EndSessionRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     session_id: str
 
 class EndSessionResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     session_id: str
     status: str
     ended_at: Optional[str] = None
@@ -33,11 +51,12 @@ async def start_session(
     No authentication required.
     """
     try:
-        service = SessionService()
+        service = _get_session_service()
         admin_id = request.admin_id if request else "anonymous"
         session_data = service.create_session(admin_id)
         
-        return StartSessionResponse(
+        # Fields come straight from the service layer - no need to re-validate.
+        return StartSessionResponse.model_construct(
             session_id=session_data["session_id"],
             status=session_data["status"],
             created_at=session_data["created_at"]
@@ -45,7 +64,7 @@ async def start_session(
     except Exception as e:
         logger.error(f"Failed to start session: {e}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not start session"
         )
 
@@ -55,10 +74,10 @@ async def start_anonymous_session():
     Start an anonymous session without any authentication.
     """
     try:
-        service = SessionService()
+        service = _get_session_service()
         session_data = service.create_session("anonymous")
         
-        return StartSessionResponse(
+        return StartSessionResponse.model_construct(
             session_id=session_data["session_id"],
             status=session_data["status"],
             created_at=session_data["created_at"]
@@ -75,13 +94,18 @@ async def end_session(
     request: EndSessionRequest
 ):
     try:
-        service = SessionService()
+        service = _get_session_service()
         # Verify session existence/ownership could happen here or in service.
         # For valid end, we just declare it ended.
-        
+
         session_data = service.end_session(request.session_id)
+
+        # Drop any cached copy so ended sessions are not served from the
+        # chat route's session cache within its TTL window.
+        from app.api.routes.chat import _session_cache
+        _session_cache.delete(request.session_id)
         
-        return EndSessionResponse(
+        return EndSessionResponse.model_construct(
             session_id=session_data["session_id"],
             status=session_data["status"],
             ended_at=session_data.get("ended_at")
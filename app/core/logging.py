@@ -1,10 +1,17 @@
 import logging
+import os
 import sys
 from app.core.config import settings
 
 def setup_logging():
+    level = settings.LOG_LEVEL
+    # Default to WARNING in production unless LOG_LEVEL is explicitly set:
+    # INFO-level f-string formatting on hot insert paths costs measurable CPU.
+    if settings.ENV == "production" and "LOG_LEVEL" not in os.environ:
+        level = "WARNING"
+
     logging.basicConfig(
-        level=settings.LOG_LEVEL,
+        level=level,
         format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
         handlers=[logging.StreamHandler(sys.stdout)],
     )
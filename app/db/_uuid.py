@@ -0,0 +1,29 @@
+# app/db/_uuid.py
+
+"""
+Shared admin_id normalization.
+
+Every repo used to repeat the same try/except uuid.UUID(admin_id) block per
+insert. The parse is not free at request volume, and the set of admin ids a
+warm process sees is small, so the result is memoized with lru_cache.
+"""
+
+from functools import lru_cache
+import uuid
+
+# Fixed UUID used for anonymous / unparseable admin ids
+ANONYMOUS_ADMIN_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+@lru_cache(maxsize=4096)
+def normalize_admin_id(admin_id: str) -> str:
+    """
+    Returns admin_id as a canonical UUID string.
+    "anonymous", empty, or invalid ids map to the fixed anonymous UUID.
+    """
+    if not admin_id or admin_id == "anonymous":
+        return ANONYMOUS_ADMIN_UUID
+    try:
+        return str(uuid.UUID(admin_id))
+    except ValueError:
+        return ANONYMOUS_ADMIN_UUID
@@ -0,0 +1,125 @@
+# app/db/async_supabase.py
+
+"""
+Async access to the Chatbot Supabase PostgREST endpoint.
+
+supabase-py is synchronous: calling it from inside `async def` handlers
+blocks the uvicorn event loop for the duration of each HTTP round-trip and
+serializes concurrent chat requests on a single worker. Hot read/write
+paths (session lookup, chat history, audit log) go through this shared
+httpx.AsyncClient instead, so they yield to the event loop while waiting
+on Supabase.
+"""
+
+from typing import Any, Dict, List, Optional
+import httpx
+from app.core.config import settings
+import logging
+
+# orjson decodes PostgREST's row arrays ~3x faster than stdlib json and is
+# already an optional dependency (response serialization in app.main).
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """httpx needs the optional h2 package for HTTP/2 (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_chatbot_async_client() -> httpx.AsyncClient:
+    """
+    Returns a singleton httpx.AsyncClient for the Chatbot PostgREST API.
+    One connection pool per warm process, shared by all repositories.
+
+    HTTP/2 is enabled when the optional h2 package is installed, so
+    concurrent PostgREST calls (session lookup, chat-history insert, audit
+    insert) multiplex over one TCP+TLS connection instead of paying a
+    handshake each.
+    """
+    global _async_client
+
+    if _async_client is None:
+        logger.info("Initializing Chatbot async PostgREST client")
+        _async_client = httpx.AsyncClient(
+            http2=_http2_available(),
+            base_url=f"{settings.CHATBOT_SUPABASE_URL}/rest/v1",
+            headers={
+                "apikey": settings.CHATBOT_SUPABASE_SERVICE_ROLE_KEY,
+                "Authorization": f"Bearer {settings.CHATBOT_SUPABASE_SERVICE_ROLE_KEY}",
+                "Content-Type": "application/json",
+                "Prefer": "return=representation",
+            },
+            timeout=httpx.Timeout(settings.REQUEST_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.MAX_CONNECTIONS,
+                max_keepalive_connections=20,
+                keepalive_expiry=30,
+            ),
+        )
+
+    return _async_client
+
+
+async def insert_row(table: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Inserts a single row and returns the inserted representation.
+
+    Args:
+        table: Table name
+        data: Column -> value mapping
+
+    Returns:
+        List of inserted rows (PostgREST returns a JSON array)
+    """
+    client = get_chatbot_async_client()
+    response = await client.post(f"/{table}", json=data)
+    response.raise_for_status()
+    return _loads(response.content) if response.content else []
+
+
+async def call_rpc(function: str, params: Dict[str, Any]) -> Any:
+    """
+    Calls a Postgres function exposed via PostgREST's /rpc endpoint.
+
+    Args:
+        function: Function name (e.g. "record_chat_turn")
+        params: Named function arguments
+
+    Returns:
+        The function's JSON result (None for void functions)
+    """
+    client = get_chatbot_async_client()
+    response = await client.post(f"/rpc/{function}", json=params)
+    response.raise_for_status()
+    return _loads(response.content) if response.content else None
+
+
+async def select_rows(table: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Runs a SELECT against PostgREST using query-string filters.
+
+    Args:
+        table: Table name
+        params: PostgREST query params, e.g.
+                {"select": "session_id,status", "session_id": "eq.<uuid>", "limit": "1"}
+
+    Returns:
+        List of matching rows (empty list if none)
+    """
+    client = get_chatbot_async_client()
+    response = await client.get(f"/{table}", params=params)
+    response.raise_for_status()
+    return _loads(response.content)
@@ -1,5 +1,7 @@
 from typing import Dict, Any, Optional
 from app.db.supabase import get_chatbot_supabase_client
+from app.db import async_supabase
+from app.db._uuid import normalize_admin_id
 from datetime import datetime
 import logging
 
@@ -10,44 +12,66 @@ class AuditRepo:
         self.supabase = get_chatbot_supabase_client()
         self.table = "audit_logs"
 
+    def _build_row(self, admin_id: str, action: str, details: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Builds the audit_logs row dict shared by the sync and async writers.
+        Handles UUID conversion for admin_id.
+        """
+        data = {
+            "admin_id": normalize_admin_id(admin_id),
+            "action": action,
+            "metadata": details or {},  # Schema uses 'metadata', not 'details'
+        }
+        if session_id:
+            data["session_id"] = session_id
+        return data
+
     def log_action(self, admin_id: str, action: str, details: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None) -> bool:
         """
         Logs an admin action. Append-only.
         Handles UUID conversion for admin_id.
-        
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            import uuid
-            
-            # Convert admin_id to UUID if needed
-            if admin_id == "anonymous" or not admin_id:
-                admin_uuid = "00000000-0000-0000-0000-000000000000"
-            else:
-                try:
-                    admin_uuid = str(uuid.UUID(admin_id))
-                except ValueError:
-                    admin_uuid = "00000000-0000-0000-0000-000000000000"
-            
-            data = {
-                "admin_id": admin_uuid,
-                "action": action,
-                "metadata": details or {},  # Schema uses 'metadata', not 'details'
-            }
-            if session_id:
-                data["session_id"] = session_id
-            
+            data = self._build_row(admin_id, action, details, session_id)
+
             result = self.supabase.table(self.table).insert(data).execute()
-            
+
             if result.data:
-                logger.debug(f"Audit logged: {action} for admin {admin_uuid}")
+                logger.debug(f"Audit logged: {action} for admin {data['admin_id']}")
+                return True
+            else:
+                logger.error(f"Failed to log audit action: {action}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Error logging audit action: {e}")
+            # Audit failure shouldn't crash the app, but should be noted.
+            return False
+
+    async def log_action_async(self, admin_id: str, action: str, details: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None) -> bool:
+        """
+        Async variant of log_action for use inside async handlers.
+        Writes via the shared httpx client so the event loop is not blocked.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            data = self._build_row(admin_id, action, details, session_id)
+
+            result = await async_supabase.insert_row(self.table, data)
+
+            if result:
+                logger.debug(f"Audit logged: {action} for admin {data['admin_id']}")
                 return True
             else:
                 logger.error(f"Failed to log audit action: {action}")
                 return False
-                
+
         except Exception as e:
-            logger.error(f"Error logging audit action: {e}", exc_info=True)
+            logger.error(f"Error logging audit action: {e}")
             # Audit failure shouldn't crash the app, but should be noted.
             return False
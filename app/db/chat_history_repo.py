@@ -1,7 +1,9 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Any, Optional
 from app.db.supabase import get_chatbot_supabase_client
+from app.db import async_supabase
+from app.db._uuid import normalize_admin_id
+from app.utils.cache import get_cached, set_cached, delete_cached, cache_key_chat_history, cache_key_chat_rows
 import logging
-import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,47 @@ class ChatHistoryRepo:
         self.supabase = get_chatbot_supabase_client()
         self.table = "chat_history"
     
+    def _build_row(
+        self,
+        session_id: str,
+        admin_id: str,
+        user_message: str,
+        assistant_response: str,
+        source_type: Optional[str] = None,
+        response_time_ms: Optional[int] = None,
+        tokens_used: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Builds the chat_history row dict shared by the sync and async writers.
+        Handles UUID conversion for admin_id.
+        """
+        data = {
+            "session_id": session_id,
+            "admin_id": normalize_admin_id(admin_id),
+            "user_message": user_message,
+            "assistant_response": assistant_response,
+        }
+
+        if source_type:
+            data["source_type"] = source_type
+
+        if response_time_ms is not None:
+            data["response_time_ms"] = response_time_ms
+
+        if tokens_used is not None:
+            data["tokens_used"] = tokens_used
+
+        return data
+
+    def _invalidate_history_cache(self, session_id: str) -> None:
+        """
+        Drops cached history for a session after a write.
+        Clears both the raw-row cache (this repo) and the converted
+        conversation cache (MemoryRepo) since both views are now stale.
+        """
+        delete_cached(cache_key_chat_rows(session_id))
+        delete_cached(cache_key_chat_history(session_id))
+
     def save_chat_history(
         self,
         session_id: str,
@@ -27,7 +70,7 @@ class ChatHistoryRepo:
     ) -> bool:
         """
         Saves a chat history entry (user message + assistant response pair).
-        
+
         Args:
             session_id: Session UUID
             admin_id: Admin/user ID (will be converted to UUID if needed)
@@ -36,58 +79,123 @@ class ChatHistoryRepo:
             source_type: Optional source type ('crm', 'lms', 'rms', 'rag', 'none')
             response_time_ms: Optional response time in milliseconds
             tokens_used: Optional number of tokens used
-            
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Convert admin_id to UUID if it's not already
-            # Handle "anonymous" or other string IDs
-            if admin_id == "anonymous" or not admin_id:
-                # Use a fixed UUID for anonymous users
-                admin_uuid = "00000000-0000-0000-0000-000000000000"
-            else:
-                try:
-                    # Try to parse as UUID
-                    admin_uuid = str(uuid.UUID(admin_id))
-                except ValueError:
-                    # If not a valid UUID, use anonymous UUID
-                    admin_uuid = "00000000-0000-0000-0000-000000000000"
-            
-            data = {
-                "session_id": session_id,
-                "admin_id": admin_uuid,
-                "user_message": user_message,
-                "assistant_response": assistant_response,
-            }
-            
-            if source_type:
-                data["source_type"] = source_type
-            
-            if response_time_ms is not None:
-                data["response_time_ms"] = response_time_ms
-            
-            if tokens_used is not None:
-                data["tokens_used"] = tokens_used
-            
+            data = self._build_row(
+                session_id, admin_id, user_message, assistant_response,
+                source_type, response_time_ms, tokens_used
+            )
+
             result = self.supabase.table(self.table).insert(data).execute()
             
             if result.data and len(result.data) > 0:
-                logger.info(f"Successfully saved chat history for session {session_id[:8]}... (id: {result.data[0].get('id')})")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Successfully saved chat history for session {session_id[:8]}... (id: {result.data[0].get('id')})")
+                self._invalidate_history_cache(session_id)
                 return True
             else:
                 logger.error(f"Failed to save chat history - no data returned")
                 return False
                 
         except Exception as e:
-            logger.error(f"Error saving chat history: {e}", exc_info=True)
+            logger.error(f"Error saving chat history: {e}")
             # Log more details about the error
             if hasattr(e, 'args') and len(e.args) > 0:
                 error_details = e.args[0]
                 if isinstance(error_details, dict):
                     logger.error(f"Error details: {error_details}")
             return False
-    
+
+    async def save_chat_history_async(
+        self,
+        session_id: str,
+        admin_id: str,
+        user_message: str,
+        assistant_response: str,
+        source_type: Optional[str] = None,
+        response_time_ms: Optional[int] = None,
+        tokens_used: Optional[int] = None
+    ) -> bool:
+        """
+        Async variant of save_chat_history for use inside async handlers.
+        Writes via the shared httpx client so the event loop is not blocked.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            data = self._build_row(
+                session_id, admin_id, user_message, assistant_response,
+                source_type, response_time_ms, tokens_used
+            )
+
+            result = await async_supabase.insert_row(self.table, data)
+
+            if result:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Successfully saved chat history for session {session_id[:8]}... (id: {result[0].get('id')})")
+                self._invalidate_history_cache(session_id)
+                return True
+            else:
+                logger.error(f"Failed to save chat history - no data returned")
+                return False
+
+        except Exception as e:
+            logger.error(f"Error saving chat history: {e}")
+            return False
+
+    async def record_chat_turn_async(
+        self,
+        session_id: str,
+        admin_id: str,
+        user_message: str,
+        assistant_response: str,
+        source_type: Optional[str] = None,
+        response_time_ms: Optional[int] = None,
+        tokens_used: Optional[int] = None
+    ) -> bool:
+        """
+        Persists a complete chat turn via the record_chat_turn RPC.
+        The Postgres function inserts the chat_history row and its
+        chat_completed audit entry in one transaction, so a turn costs a
+        single network round-trip instead of two sequential inserts.
+
+        Returns:
+            True if the RPC succeeded, False otherwise (callers should fall
+            back to save_chat_history_async + a separate audit write)
+        """
+        try:
+            data = self._build_row(
+                session_id, admin_id, user_message, assistant_response,
+                source_type, response_time_ms, tokens_used
+            )
+
+            result = await async_supabase.call_rpc(
+                "record_chat_turn",
+                {
+                    "p_session_id": data["session_id"],
+                    "p_admin_id": data["admin_id"],
+                    "p_user_message": user_message,
+                    "p_assistant_response": assistant_response,
+                    "p_source_type": source_type,
+                    "p_response_time_ms": response_time_ms,
+                    "p_tokens_used": tokens_used,
+                },
+            )
+
+            if result is not None:
+                self._invalidate_history_cache(session_id)
+                return True
+            return False
+
+        except Exception as e:
+            # RPC may not be deployed yet - callers fall back to separate writes
+            logger.warning(f"record_chat_turn RPC failed, falling back to separate writes: {e}")
+            return False
+
     def get_chat_history(
         self,
         session_id: str,
@@ -103,17 +211,30 @@ class ChatHistoryRepo:
         Returns:
             List of chat history records
         """
+        # Optional: Try cache first (non-breaking if cache unavailable)
+        cache_key = cache_key_chat_rows(session_id)
+        cached = get_cached(cache_key)
+        if cached is not None:
+            logger.debug(f"Cache hit for chat rows: {session_id[:8]}...")
+            return cached
+
         try:
+            # Project only the columns callers use - select("*") pulled every
+            # column of up to `limit` rows across the wire. range() maps to a
+            # PostgREST Range header so pagination metadata comes for free.
             response = (
                 self.supabase.table(self.table)
-                .select("*")
+                .select("id, session_id, user_message, assistant_response, source_type, created_at")
                 .eq("session_id", session_id)
                 .order("created_at", desc=True)
-                .limit(limit)
+                .range(0, limit - 1)
                 .execute()
             )
             
-            return response.data if response.data else []
+            rows = response.data if response.data else []
+            # Optional: Cache the result (non-breaking if cache fails)
+            set_cached(cache_key, rows)
+            return rows
             
         except Exception as e:
             logger.error(f"Error fetching chat history: {e}", exc_info=True)
@@ -137,10 +258,10 @@ class ChatHistoryRepo:
         try:
             response = (
                 self.supabase.table(self.table)
-                .select("*")
+                .select("id, session_id, user_message, assistant_response, source_type, created_at")
                 .eq("admin_id", admin_id)
                 .order("created_at", desc=True)
-                .limit(limit)
+                .range(0, limit - 1)
                 .execute()
             )
             
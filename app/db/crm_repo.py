@@ -1,11 +1,292 @@
 from typing import Any, List, Dict, Optional
 from app.db.supabase import get_edify_supabase_client
+from app.core.config import settings
+from app.utils.cache import get_cached, set_cached, cache_key_crm_results
+from app.utils.ttl_cache import TTLCache
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, timedelta, date
 import re
 
 logger = logging.getLogger(__name__)
 
+# Table detection keywords with comprehensive synonyms (LENIENT matching)
+_TABLE_KEYWORDS = {
+    "campaigns": ["campaign", "campaigns", "marketing campaign", "marketing"],
+    "tasks": ["task", "tasks", "todo", "todos", "to-do", "to do"],
+    "trainers": ["trainer", "trainers", "instructor", "instructors", "teacher", "teachers"],
+    "learners": ["learner", "learners", "student", "students", "trainee", "trainees"],
+    "Course": ["course", "courses", "program", "programs", "curriculum", "curricula"],
+    "activity": ["activity", "activities", "log", "logs", "event", "events"],
+    "notes": ["note", "notes", "comment", "comments", "remark", "remarks"],
+    "leads": ["lead", "leads", "prospect", "prospects", "enquiry", "enquiries",
+              "inquiry", "inquiries", "customer lead", "potential customer"]
+}
+
+# Intent detection tokenizes the query once and looks each token up in a
+# plain dict - word boundaries come for free because tokens are whole words,
+# and for a keyword set this small the C-level dict probes beat re-scanning
+# the query per keyword. The handful of multi-word synonyms ("marketing
+# campaign", "to do", ...) keep one small compiled alternation.
+# Deliberately stdlib-only: compiled extensions (pyahocorasick/hyperscan/
+# Cython) were considered and rejected - the serverless deploy has no build
+# step, and for ~40 keywords on short chat queries the scan is already far
+# below the Supabase round-trip that dominates each request.
+
+# Integer table ids for the scoring hot path: a fixed-size array indexed by
+# ordinal beats a str-keyed dict (no hashing per increment, trivial max()).
+_ID_TO_TABLE = tuple(_TABLE_KEYWORDS)
+_KEYWORD_TO_TABLE_ID = {
+    kw: tid for tid, (_, kws) in enumerate(_TABLE_KEYWORDS.items()) for kw in kws
+}
+_ZERO_SCORES = array('i', [0]) * len(_ID_TO_TABLE)
+
+_WORD_RE = re.compile(r'\w+')
+_SINGLE_KEYWORD_TO_ID = {
+    kw: tid for kw, tid in _KEYWORD_TO_TABLE_ID.items() if _WORD_RE.fullmatch(kw)
+}
+_PHRASE_KEYWORD_RE = re.compile(
+    r'\b(?:'
+    + '|'.join(sorted(
+        (re.escape(kw) for kw in _KEYWORD_TO_TABLE_ID if not _WORD_RE.fullmatch(kw)),
+        key=len, reverse=True))
+    + r')\b'
+)
+
+# Date keyword patterns, compiled once instead of per _parse_date_filters call
+_TODAY_RE = re.compile(r'\btoday\b')
+_YESTERDAY_RE = re.compile(r'\byesterday\b')
+_THIS_WEEK_RE = re.compile(r'\bthis week\b')
+_NEW_RE = re.compile(r'\bnew\b')
+
+# Patterns that indicate "get all" intent (LENIENT matching), compiled once
+_LIST_QUERY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # "all [entity]" patterns
+    r'\ball\s+(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
+    # "[entity] details/info/data" patterns
+    r'(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)\s+(?:details?|information|info|data)',
+    # "list [entity]" patterns
+    r'list\s+(?:out\s+)?(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
+    # "show [entity]" patterns
+    r'show\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
+    # "get [entity]" patterns
+    r'get\s+(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
+    # "give [entity]" patterns
+    r'give\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
+    # "display [entity]" patterns
+    r'display\s+(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
+    # Just entity name alone (e.g., "leads", "trainers")
+    r'^(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)$',
+    # "crm [entity]" or "[entity] in crm"
+    r'(?:crm\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)(?:\s+in\s+crm)?',
+    # "crm data" or "crm information"
+    r'crm\s+(?:data|information|info)'
+))
+
+# Common query words that don't represent actual search terms.
+# This list is comprehensive to catch all variations.
+_QUERY_STOPWORDS = (
+    # Date keywords
+    'today', 'yesterday', 'this week', 'new', 'recent',
+    # Action verbs
+    'show', 'shows', 'display', 'get', 'give', 'list', 'find', 'fetch', 'search',
+    'see', 'view', 'tell', 'provide', 'return', 'bring',
+    # Pronouns and filler words
+    'me', 'my', 'i', 'want', 'need', 'please', 'can', 'could', 'would',
+    # System keywords
+    'crm', 'data', 'details', 'information', 'info', 'record', 'records',
+    # Articles and determiners
+    'all', 'the', 'a', 'an', 'some', 'any', 'every', 'each',
+    # Verb forms
+    's', 'is', 'are', 'was', 'were', 'have', 'has', 'had',
+    # Entity names (will be detected separately)
+    'campaign', 'campaigns', 'lead', 'leads', 'task', 'tasks',
+    'trainer', 'trainers', 'learner', 'learners', 'course', 'courses',
+    'activity', 'activities', 'note', 'notes',
+    # Common connectors
+    'out', 'of', 'in', 'from', 'with', 'for', 'to'
+)
+# Single alternation (longest first, so "campaigns" wins over "campaign"):
+# one linear sub pass removes every stopword instead of rewriting the whole
+# string once per keyword.
+_STOPWORDS_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted(map(re.escape, _QUERY_STOPWORDS), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+# Fast path for trivial queries like "show me all leads": nothing but
+# stopwords and punctuation, and none of the date-trigger words, so the
+# filter result is known to be empty without running the full parse.
+# Date triggers are excluded from the alternation so "leads today" falls
+# through to the date branches.
+_DATE_TRIGGER_WORDS = frozenset(('today', 'yesterday', 'this week', 'new'))
+_TRIVIAL_QUERY_RE = re.compile(
+    r'^(?:[\s,.!?]*\b(?:'
+    + '|'.join(sorted(
+        (re.escape(word) for word in _QUERY_STOPWORDS if word not in _DATE_TRIGGER_WORDS),
+        key=len, reverse=True))
+    + r')\b)+[\s,.!?]*$',
+    re.IGNORECASE
+)
+_EMPTY_FILTERS = (None, None, False, None)
+
+# text_query is interpolated into PostgREST's filter mini-DSL; characters
+# like , % * ( ) would be parsed as syntax there. Whitelist word chars,
+# whitespace and hyphens, and cap the length so adversarial input cannot
+# produce pathological LIKE patterns on the Postgres side.
+_UNSAFE_QUERY_CHARS_RE = re.compile(r'[^\w\s-]')
+_MAX_TEXT_QUERY_LEN = 64
+
+# Paginated results get their own small cache plus a single background
+# worker that warms the next page: users who paginate almost always ask
+# for page n+1, so by the time they do it is usually already local.
+_page_cache = TTLCache(maxsize=64, ttl=30)
+_prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crm-prefetch")
+
+# Process-local result cache in front of the (optional) Redis layer, same
+# pattern as the session cache in the chat route: always on, needs no
+# infrastructure, and absorbs the follow-up turns that re-issue an identical
+# query within seconds. TTL matches the Redis layer - Edify data is owned
+# elsewhere, so 30s of staleness is the accepted window either way.
+_results_cache = TTLCache(maxsize=256, ttl=30)
+
+# Negative cache for search_crm: a query that just blew up (bad filter,
+# transient Supabase 5xx) is remembered for a few seconds so a retry storm
+# does not hammer the primary *and* fallback query paths on every attempt.
+_failed_queries = TTLCache(maxsize=256, ttl=10)
+
+
+def _sanitize_text_query(text_query: str) -> str:
+    """Strips PostgREST/LIKE metacharacters and bounds the search term."""
+    return _UNSAFE_QUERY_CHARS_RE.sub('', text_query)[:_MAX_TEXT_QUERY_LEN].strip()
+
+
+# Leftover single words too generic to search on (previously rebuilt as a
+# set literal inside every query-building call).
+_COMMON_WORDS = frozenset((
+    'out', 'the', 'all', 'me', 'my', 'i', 'a', 'an',
+    'is', 'are', 'was', 'were', 'in', 'of', 'for', 'to', 'with'
+))
+
+
+# Struct-of-arrays view of the table configs, indexed by the same table ids
+# used for intent scoring: the hot query path does one list index per field
+# instead of nested dict lookups. TABLE_CONFIGS (below) stays the editable
+# source of truth; these tuples are derived from it at import.
+def _build_soa(field):
+    return tuple(CRMRepo.TABLE_CONFIGS[key][field] for key in _ID_TO_TABLE)
+
+
+@lru_cache(maxsize=1024)
+def _detect_table_intent_cached(query_lower: str) -> str:
+    """
+    Pure function behind CRMRepo._detect_table_intent. Chat queries repeat
+    heavily (retries, fallback re-parses), so results are memoized.
+    """
+    # Count matches for each table: one token pass + one phrase scan.
+    # hit_mask tracks which tables scored at all - nearly every query names
+    # exactly one table, so the common case skips the max()/index() scan.
+    scores = array('i', _ZERO_SCORES)
+    hit_mask = 0
+
+    for token in _WORD_RE.findall(query_lower):
+        table_id = _SINGLE_KEYWORD_TO_ID.get(token)
+        if table_id is not None:
+            scores[table_id] += 1
+            hit_mask |= 1 << table_id
+
+    for match in _PHRASE_KEYWORD_RE.finditer(query_lower):
+        table_id = _KEYWORD_TO_TABLE_ID[match.group()]
+        scores[table_id] += 1
+        hit_mask |= 1 << table_id
+
+    if hit_mask == 0:
+        # No specific table mentioned, default to leads
+        return "leads"
+
+    if hit_mask & (hit_mask - 1) == 0:
+        # Exactly one table mentioned - no scoring needed
+        return _ID_TO_TABLE[hit_mask.bit_length() - 1]
+
+    # Table with the highest score (earliest id wins ties)
+    return _ID_TO_TABLE[scores.index(max(scores))]
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_filters_cached(query: str, today_ordinal: int) -> tuple:
+    """
+    Pure function behind CRMRepo._parse_date_filters. Returns an immutable
+    (start_iso, end_iso, is_new, text_query) tuple - dates come back as ISO
+    strings ready for PostgREST - and today_ordinal keys the cache so date
+    ranges expire at midnight.
+    """
+    # Fast path: all-stopword queries (no date triggers) parse to no filters
+    if _TRIVIAL_QUERY_RE.match(query):
+        return _EMPTY_FILTERS
+
+    query_lower = query.lower()
+    start_date = None
+    end_date = None
+    is_new = False
+    text_query_out = None
+
+    # Get today's date range (start and end of day)
+    today_start = datetime.combine(date.fromordinal(today_ordinal), datetime.min.time())
+    today_end = today_start + timedelta(days=1, microseconds=-1)
+
+    # Each regex runs only after a C-level substring check - most queries
+    # carry no date keyword at all, so the common case never enters sre.
+    # Check for "today" keyword
+    if 'today' in query_lower and _TODAY_RE.search(query_lower):
+        start_date = today_start
+        end_date = today_end
+
+    # Check for "yesterday" keyword
+    elif 'yesterday' in query_lower and _YESTERDAY_RE.search(query_lower):
+        start_date = today_start - timedelta(days=1)
+        end_date = today_end - timedelta(days=1)
+
+    # Check for "this week" keyword
+    elif 'this week' in query_lower and _THIS_WEEK_RE.search(query_lower):
+        days_since_monday = today_start.weekday()
+        start_date = today_start - timedelta(days=days_since_monday)
+        end_date = today_end
+
+    # Check for "new" keyword (typically means recent, e.g., last 7 days)
+    if 'new' in query_lower and _NEW_RE.search(query_lower):
+        is_new = True
+        # If no other date filter, default "new" to last 7 days
+        if start_date is None:
+            start_date = today_start - timedelta(days=7)
+            end_date = today_end
+
+    # Store ISO strings: that is the form every consumer (PostgREST gte/lte)
+    # needs, and formatting here happens once per (query, day) thanks to the
+    # lru_cache instead of on every _build_query call.
+    if start_date is not None:
+        start_date = start_date.isoformat()
+        end_date = end_date.isoformat()
+
+    # STEP 3: Detect if this is a LIST/GET/SHOW query (should return all records)
+    is_list_query = any(pattern.search(query_lower) for pattern in _LIST_QUERY_PATTERNS)
+
+    # STEP 4: Extract text query ONLY if this is NOT a list query
+    # For list queries, we return all records without text filtering
+    if not is_list_query:
+        # Remove common query words that don't represent actual search terms
+        text_query = _STOPWORDS_RE.sub('', query)
+        text_query = ' '.join(text_query.split())  # Clean up extra spaces
+
+        # Only use as text query if there's meaningful content left (more than 2 chars)
+        if text_query and len(text_query) > 2:
+            text_query_out = text_query
+
+    return (start_date, end_date, is_new, text_query_out)
+
+
 class CRMRepo:
     """
     Repository for CRM data access.
@@ -15,52 +296,62 @@ class CRMRepo:
     """
     
     # Table configurations with exact field names from Edify Supabase
+    # select_cols lists only the columns the chatbot actually renders
+    # (id + searchable fields + date), so wide rows are never shipped.
     TABLE_CONFIGS = {
         "campaigns": {
             "table": "campaigns",
             "search_fields": ["name", "status", "type", "campaign_owner", "phone"],
+            "select_cols": "id,name,status,type,campaign_owner,phone,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "leads": {
             "table": "leads",
             "search_fields": ["name", "email", "phone", "lead_status", "course_list", "lead_source", "lead_owner"],
+            "select_cols": "id,name,email,phone,lead_status,course_list,lead_source,lead_owner,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "tasks": {
             "table": "tasks",
             "search_fields": ["subject", "priority", "status", "task_type"],
+            "select_cols": "id,subject,priority,status,task_type,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "trainers": {
             "table": "trainers",
             "search_fields": ["trainer_name", "trainer_status", "tech_stack", "email", "phone", "location"],
+            "select_cols": "id,trainer_name,trainer_status,tech_stack,email,phone,location,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "learners": {
             "table": "learners",
             "search_fields": ["name", "email", "phone", "status", "course", "location"],
+            "select_cols": "id,name,email,phone,status,course,location,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "Course": {
             "table": "Course",  # Note: capital C as per schema
             "search_fields": ["title", "description", "trainer", "duration"],
+            "select_cols": "id,title,description,trainer,duration,createdAt",
             "date_field": "createdAt",  # Note: camelCase as per schema
             "order_field": "createdAt"
         },
         "activity": {
             "table": "activity",
             "search_fields": ["activity_name"],
+            "select_cols": "id,activity_name,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "notes": {
             "table": "notes",
             "search_fields": ["content"],
+            "select_cols": "id,content,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         }
@@ -75,193 +366,100 @@ class CRMRepo:
         Uses LENIENT matching with synonyms and variations.
         Returns table key or "leads" as default.
         """
-        query_lower = query.lower()
-        
-        # Table detection keywords with comprehensive synonyms (LENIENT matching)
-        table_keywords = {
-            "campaigns": ["campaign", "campaigns", "marketing campaign", "marketing"],
-            "tasks": ["task", "tasks", "todo", "todos", "to-do", "to do"],
-            "trainers": ["trainer", "trainers", "instructor", "instructors", "teacher", "teachers"],
-            "learners": ["learner", "learners", "student", "students", "trainee", "trainees"],
-            "Course": ["course", "courses", "program", "programs", "curriculum", "curricula"],
-            "activity": ["activity", "activities", "log", "logs", "event", "events"],
-            "notes": ["note", "notes", "comment", "comments", "remark", "remarks"],
-            "leads": ["lead", "leads", "prospect", "prospects", "enquiry", "enquiries", 
-                     "inquiry", "inquiries", "customer lead", "potential customer"]
-        }
-        
-        # Count matches for each table
-        table_scores = {table: 0 for table in self.TABLE_CONFIGS.keys()}
-        
-        for table, keywords in table_keywords.items():
-            for keyword in keywords:
-                if re.search(rf'\b{keyword}\b', query_lower):
-                    table_scores[table] += 1
-        
-        # Find table with highest score
-        max_score = max(table_scores.values())
-        if max_score == 0:
-            # No specific table mentioned, default to leads
-            return "leads"
-        
-        # Return table with highest score
-        for table, score in table_scores.items():
-            if score == max_score:
-                return table
-        
-        return "leads"  # Default fallback
-    
+        return _detect_table_intent_cached(query.lower())
+
     def _parse_date_filters(self, query: str) -> Dict[str, Any]:
         """
         Parses date-related keywords from the query string.
         Returns a dict with date filter information.
         """
-        query_lower = query.lower()
-        filters = {
-            "start_date": None,
-            "end_date": None,
-            "is_new": False,
-            "text_query": None
+        # Keyed on the day ordinal so "today"/"this week" results roll over
+        # at midnight instead of serving stale ranges from the cache.
+        start_date, end_date, is_new, text_query = _parse_date_filters_cached(
+            query, date.today().toordinal()
+        )
+        # Callers mutate the filter dict, so each gets a fresh one.
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "is_new": is_new,
+            "text_query": text_query
         }
-        
-        # Get today's date range (start and end of day)
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        # Check for "today" keyword
-        if re.search(r'\btoday\b', query_lower):
-            filters["start_date"] = today_start
-            filters["end_date"] = today_end
-        
-        # Check for "yesterday" keyword
-        elif re.search(r'\byesterday\b', query_lower):
-            yesterday_start = today_start - timedelta(days=1)
-            yesterday_end = today_end - timedelta(days=1)
-            filters["start_date"] = yesterday_start
-            filters["end_date"] = yesterday_end
-        
-        # Check for "this week" keyword
-        elif re.search(r'\bthis week\b', query_lower):
-            days_since_monday = datetime.now().weekday()
-            week_start = today_start - timedelta(days=days_since_monday)
-            filters["start_date"] = week_start
-            filters["end_date"] = today_end
-        
-        # Check for "new" keyword (typically means recent, e.g., last 7 days)
-        if re.search(r'\bnew\b', query_lower):
-            filters["is_new"] = True
-            # If no other date filter, default "new" to last 7 days
-            if filters["start_date"] is None:
-                filters["start_date"] = today_start - timedelta(days=7)
-                filters["end_date"] = today_end
-        
-        # STEP 3: Detect if this is a LIST/GET/SHOW query (should return all records)
-        # Patterns that indicate "get all" intent (LENIENT matching)
-        list_query_patterns = [
-            # "all [entity]" patterns
-            r'\ball\s+(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
-            # "[entity] details/info/data" patterns
-            r'(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)\s+(?:details?|information|info|data)',
-            # "list [entity]" patterns
-            r'list\s+(?:out\s+)?(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
-            # "show [entity]" patterns
-            r'show\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
-            # "get [entity]" patterns
-            r'get\s+(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
-            # "give [entity]" patterns
-            r'give\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
-            # "display [entity]" patterns
-            r'display\s+(?:all\s+)?(?:the\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)',
-            # Just entity name alone (e.g., "leads", "trainers")
-            r'^(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)$',
-            # "crm [entity]" or "[entity] in crm"
-            r'(?:crm\s+)?(?:trainers?|leads?|campaigns?|tasks?|learners?|courses?|activities?|notes?)(?:\s+in\s+crm)?',
-            # "crm data" or "crm information"
-            r'crm\s+(?:data|information|info)'
-        ]
-        
-        is_list_query = any(re.search(pattern, query_lower) for pattern in list_query_patterns)
-        
-        # STEP 4: Extract text query ONLY if this is NOT a list query
-        # For list queries, we return all records without text filtering
-        if not is_list_query:
-            text_query = query
-            # Remove common query words that don't represent actual search terms
-            # This list is comprehensive to catch all variations
-            query_words = [
-                # Date keywords
-                'today', 'yesterday', 'this week', 'new', 'recent',
-                # Action verbs
-                'show', 'shows', 'display', 'get', 'give', 'list', 'find', 'fetch', 'search',
-                'see', 'view', 'tell', 'provide', 'return', 'bring',
-                # Pronouns and filler words
-                'me', 'my', 'i', 'want', 'need', 'please', 'can', 'could', 'would',
-                # System keywords
-                'crm', 'data', 'details', 'information', 'info', 'record', 'records',
-                # Articles and determiners
-                'all', 'the', 'a', 'an', 'some', 'any', 'every', 'each',
-                # Verb forms
-                's', 'is', 'are', 'was', 'were', 'have', 'has', 'had',
-                # Entity names (will be detected separately)
-                'campaign', 'campaigns', 'lead', 'leads', 'task', 'tasks',
-                'trainer', 'trainers', 'learner', 'learners', 'course', 'courses',
-                'activity', 'activities', 'note', 'notes',
-                # Common connectors
-                'out', 'of', 'in', 'from', 'with', 'for', 'to'
-            ]
-            for keyword in query_words:
-                text_query = re.sub(rf'\b{keyword}\b', '', text_query, flags=re.IGNORECASE)
-            text_query = ' '.join(text_query.split())  # Clean up extra spaces
-            
-            # Only use as text query if there's meaningful content left (more than 2 chars)
-            if text_query.strip() and len(text_query.strip()) > 2:
-                filters["text_query"] = text_query.strip()
-        
-        return filters
     
-    def _build_query(self, table_config: Dict[str, Any], filters: Dict[str, Any], limit: int = 50):
+    def _apply_filters(self, query_builder, table_id: int, filters: Dict[str, Any]):
         """
-        Builds and executes Supabase query based on table config and filters.
+        Applies date and text filters to a PostgREST query builder.
+        Shared by _build_query and search_crm_paginated so filter semantics
+        (sanitization, FTS/trigram switching, the common-word guard) live in
+        exactly one place. Returns (query_builder, text_query_applied).
         """
-        table_name = table_config["table"]
-        search_fields = table_config["search_fields"]
-        date_field = table_config["date_field"]
-        order_field = table_config["order_field"]
-        
-        query_builder = self.supabase.table(table_name).select("*")
-        
-        # Apply date filters if present
+        # Apply date filters if present (already ISO-formatted by the parser)
         if filters["start_date"] and filters["end_date"]:
-            # Format dates for Supabase (ISO format)
-            start_iso = filters["start_date"].isoformat()
-            end_iso = filters["end_date"].isoformat()
-            
-            query_builder = query_builder.gte(date_field, start_iso)
-            query_builder = query_builder.lte(date_field, end_iso)
-            
-            logger.info(f"Applied date filter on {date_field}: {start_iso} to {end_iso}")
-        
-        # STEP 5: Apply filters ONLY when clear and specific
-        # Default behavior: return all records if no specific filter
-        
+            date_field = _DATE_FIELDS[table_id]
+            query_builder = query_builder.gte(date_field, filters["start_date"])
+            query_builder = query_builder.lte(date_field, filters["end_date"])
+
+            logger.info(f"Applied date filter on {date_field}: {filters['start_date']} to {filters['end_date']}")
+
         # Apply text search ONLY if there's a meaningful text query (not a list query)
         text_query_applied = False
         if filters.get("text_query"):
             # Validate text query is meaningful (not just leftover words)
-            text_query = filters["text_query"].strip()
+            text_query = _sanitize_text_query(filters["text_query"])
             # Only apply if it's longer than 2 chars and not a common word
-            common_words = {'out', 'the', 'all', 'me', 'my', 'i', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'of', 'for', 'to', 'with'}
-            if len(text_query) > 2 and text_query.lower() not in common_words:
-                # Build OR condition for all search fields
-                or_conditions = ",".join([f"{field}.ilike.%{text_query}%" for field in search_fields])
-                query_builder = query_builder.or_(or_conditions)
+            if len(text_query) > 2 and text_query.lower() not in _COMMON_WORDS:
+                if settings.ENABLE_CRM_TRGM:
+                    # pg_trgm-indexed blob of all searchable fields (see
+                    # edify_trgm.sql): same substring semantics as the OR
+                    # chain, but as one index-accelerated ILIKE
+                    query_builder = query_builder.ilike("search_blob", f"%{text_query}%")
+                elif settings.ENABLE_CRM_FTS:
+                    # GIN-indexed tsvector column (see edify_fts.sql):
+                    # index scan instead of a per-field ILIKE seq scan
+                    query_builder = query_builder.text_search(
+                        "tsv", text_query, options={"config": "simple", "type": "websearch"}
+                    )
+                else:
+                    # OR condition over all search fields (template built at import)
+                    query_builder = query_builder.or_(_OR_TEMPLATES[table_id].format(q=text_query))
                 logger.info(f"Applied text search: {text_query}")
                 text_query_applied = True
             else:
                 logger.info(f"Ignoring ambiguous text query: '{text_query}' - treating as list query")
                 # Clear the text query so we return all records
                 filters["text_query"] = None
-        
+
+        return query_builder, text_query_applied
+
+    def _build_query(self, table_key: str, filters: Dict[str, Any], limit: int = 50):
+        """
+        Builds and executes Supabase query based on table config and filters.
+        """
+        table_id = _TABLE_IDS[table_key]
+        table_name = _TABLE_NAMES[table_id]
+        search_fields = _SEARCH_FIELDS[table_id]
+        date_field = _DATE_FIELDS[table_id]
+        order_field = _ORDER_FIELDS[table_id]
+
+        # Two cache layers: the in-process TTL cache first (no round-trip at
+        # all), then the optional Redis read-through shared across instances
+        # when ENABLE_CACHING is on.
+        cache_key = cache_key_crm_results(table_name, filters, limit)
+        cached = _results_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"CRM local cache hit for {table_name}")
+            return cached
+        if settings.ENABLE_CACHING:
+            cached = get_cached(cache_key)
+            if cached is not None:
+                logger.debug(f"CRM cache hit for {table_name}")
+                _results_cache.set(cache_key, cached)
+                return cached
+
+        query_builder = self.supabase.table(table_name).select(_SELECT_COLS[table_id])
+
+        query_builder, text_query_applied = self._apply_filters(query_builder, table_id, filters)
+
         # If no date filter and no valid text query, return all records (DEFAULT BEHAVIOR)
         if not (filters["start_date"] and filters["end_date"]) and not text_query_applied:
             logger.info("No specific search criteria - returning all records (default behavior)")
@@ -271,14 +469,22 @@ class CRMRepo:
         
         # Apply limit
         response = query_builder.limit(limit).execute()
-        
-        return response.data if response.data else []
+
+        data = response.data if response.data else []
+        _results_cache.set(cache_key, data)
+        if settings.ENABLE_CACHING:
+            # 30s TTL: long enough to absorb follow-up turns, short enough
+            # that CRM edits show up quickly (Edify data is owned elsewhere,
+            # so there is no write path here to invalidate from).
+            set_cached(cache_key, data, ttl=30)
+        return data
     
     def search_crm_paginated(
-        self, 
-        query: str, 
-        page: int = 1, 
-        page_size: Optional[int] = None
+        self,
+        query: str,
+        page: int = 1,
+        page_size: Optional[int] = None,
+        _prefetch: bool = True
     ) -> Dict[str, Any]:
         """
         NEW METHOD: Paginated CRM search (does not change existing search_crm).
@@ -292,67 +498,77 @@ class CRMRepo:
         Returns:
             Dict with keys: data, total, page, page_size, has_more
         """
-        from app.core.config import settings
-        
         if page < 1:
             page = 1
         if page_size is None:
             page_size = settings.DEFAULT_PAGE_SIZE
         if page_size > settings.MAX_PAGE_SIZE:
             page_size = settings.MAX_PAGE_SIZE
-        
+
+        # Served from the page cache when the background prefetch (or a
+        # repeated request) already fetched this page.
+        page_key = (query, page, page_size)
+        cached_page = _page_cache.get(page_key)
+        if cached_page is not None:
+            logger.debug(f"CRM page cache hit for page {page}")
+            return cached_page
+
         offset = (page - 1) * page_size
-        
+
         try:
             # Detect which table to query
             table_key = self._detect_table_intent(query)
-            table_config = self.TABLE_CONFIGS[table_key]
-            
+            table_id = _TABLE_IDS[table_key]
+
             logger.info(f"Paginated search - table: {table_key}, page: {page}, page_size: {page_size}")
-            
+
             # Parse filters
             filters = self._parse_date_filters(query)
-            
-            # Build query with pagination
-            table_name = table_config["table"]
-            search_fields = table_config["search_fields"]
-            date_field = table_config["date_field"]
-            order_field = table_config["order_field"]
-            
-            query_builder = self.supabase.table(table_name).select("*", count="exact")
-            
-            # Apply filters (same logic as _build_query)
-            if filters["start_date"] and filters["end_date"]:
-                start_iso = filters["start_date"].isoformat()
-                end_iso = filters["end_date"].isoformat()
-                query_builder = query_builder.gte(date_field, start_iso)
-                query_builder = query_builder.lte(date_field, end_iso)
-            
-            text_query_applied = False
-            if filters.get("text_query"):
-                text_query = filters["text_query"].strip()
-                common_words = {'out', 'the', 'all', 'me', 'my', 'i', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'of', 'for', 'to', 'with'}
-                if len(text_query) > 2 and text_query.lower() not in common_words:
-                    or_conditions = ",".join([f"{field}.ilike.%{text_query}%" for field in search_fields])
-                    query_builder = query_builder.or_(or_conditions)
-                    text_query_applied = True
-            
+
+            # count="exact" makes Postgres evaluate the filtered set twice
+            # (once for rows, once for the count). Only page 1 needs a total
+            # for display; deeper pages infer has_more from whether the page
+            # came back full and skip the counting pass entirely.
+            count_mode = "exact" if page == 1 else None
+            query_builder = self.supabase.table(_TABLE_NAMES[table_id]).select(
+                _SELECT_COLS[table_id], count=count_mode
+            )
+
+            # Same filter semantics as _build_query (shared helper)
+            query_builder, _ = self._apply_filters(query_builder, table_id, filters)
+
             # Apply pagination
-            query_builder = query_builder.order(order_field, desc=True)
+            query_builder = query_builder.order(_ORDER_FIELDS[table_id], desc=True)
             response = query_builder.range(offset, offset + page_size - 1).execute()
             
             data = response.data if response.data else []
-            total = response.count if hasattr(response, 'count') and response.count is not None else len(data)
-            has_more = (offset + page_size) < total
+            total = response.count if hasattr(response, 'count') and response.count is not None else None
+            if total is not None:
+                has_more = (offset + page_size) < total
+            else:
+                # No count requested: a full page means there is (probably)
+                # more; total becomes the lower bound seen so far.
+                has_more = len(data) == page_size
+                total = offset + len(data)
             
-            return {
+            result = {
                 "data": data,
                 "total": total,
                 "page": page,
                 "page_size": page_size,
                 "has_more": has_more
             }
-            
+            _page_cache.set(page_key, result)
+
+            # Warm the next page off-thread; the prefetch run populates the
+            # page cache itself and must not trigger further prefetches.
+            if _prefetch and has_more:
+                _prefetch_pool.submit(
+                    self.search_crm_paginated, query, page + 1, page_size, False
+                )
+
+            return result
+
         except Exception as e:
             logger.error(f"Error in paginated CRM search: {e}", exc_info=True)
             return {
@@ -375,35 +591,57 @@ class CRMRepo:
         Returns:
             List of CRM records (raw data from Supabase)
         """
+        # Recently-failed query: answer empty immediately instead of
+        # re-running a request that is known to be failing right now.
+        if _failed_queries.get(query) is not None:
+            logger.warning(f"Skipping CRM query that failed within the last 10s: '{query}'")
+            return []
+
         try:
             # Detect which table to query
             table_key = self._detect_table_intent(query)
-            table_config = self.TABLE_CONFIGS[table_key]
-            
-            logger.info(f"Detected table: {table_key} (table: {table_config['table']})")
-            
+            table_name = _TABLE_NAMES[_TABLE_IDS[table_key]]
+
+            logger.info(f"Detected table: {table_key} (table: {table_name})")
+
             # Parse filters
             filters = self._parse_date_filters(query)
-            
+
             # Build and execute query
-            data = self._build_query(table_config, filters, limit=50)
-            
-            logger.info(f"Retrieved {len(data)} records from {table_config['table']}")
+            data = self._build_query(table_key, filters, limit=50)
+
+            logger.info(f"Retrieved {len(data)} records from {table_name}")
             return data
             
         except Exception as e:
             logger.error(f"Error searching CRM: {e}", exc_info=True)
+            # Record the failure first so concurrent retries short-circuit
+            # while the fallback below is still in flight.
+            _failed_queries.set(query, True)
             # Try fallback: query leads table with simple text search
             try:
                 logger.info("Falling back to leads table with simple text search")
                 filters = self._parse_date_filters(query)
-                table_config = self.TABLE_CONFIGS["leads"]
-                data = self._build_query(table_config, filters, limit=50)
+                data = self._build_query("leads", filters, limit=50)
+                # The fallback worked, so the query is servable after all
+                _failed_queries.delete(query)
                 return data
             except Exception as fallback_error:
                 logger.error(f"Fallback search also failed: {fallback_error}", exc_info=True)
                 return []
-    
+
+    async def search_crm_async(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Async variant of search_crm for use inside async handlers/nodes.
+        Runs the sync Supabase client on a worker thread so the event loop
+        is not blocked for the duration of the round-trip.
+        """
+        return await asyncio.to_thread(self.search_crm, query)
+
+    async def search_crm_many(self, queries: List[str]) -> List[List[Dict[str, Any]]]:
+        """Runs several searches concurrently; results match query order."""
+        return await asyncio.gather(*(self.search_crm_async(q) for q in queries))
+
     def get_all_campaigns(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all campaigns."""
         return self._get_all_from_table("campaigns", limit)
@@ -436,12 +674,43 @@ class CRMRepo:
         """Get all notes."""
         return self._get_all_from_table("notes", limit)
     
+    def get_all_tables(self, keys: Optional[List[str]] = None, limit: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetches several tables in one shot, e.g. for a dashboard snapshot.
+        The per-table queries run concurrently on a thread pool, so total
+        latency is roughly one round-trip instead of len(keys) sequential
+        ones. Returns a dict of table_key -> records.
+        """
+        if keys is None:
+            keys = list(self.TABLE_CONFIGS.keys())
+
+        with ThreadPoolExecutor(max_workers=min(len(keys), 8)) as pool:
+            results = pool.map(lambda key: self._get_all_from_table(key, limit), keys)
+
+        return dict(zip(keys, results))
+
     def _get_all_from_table(self, table_key: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Internal method to get all records from a specific table."""
         try:
-            table_config = self.TABLE_CONFIGS[table_key]
             filters = {"start_date": None, "end_date": None, "is_new": False, "text_query": None}
-            return self._build_query(table_config, filters, limit)
+            return self._build_query(table_key, filters, limit)
         except Exception as e:
             logger.error(f"Error getting all from {table_key}: {e}", exc_info=True)
             return []
+
+
+# Derived after the class body so the config dict exists; ids match
+# _ID_TO_TABLE ordering used throughout the intent scorer.
+_TABLE_IDS = {key: tid for tid, key in enumerate(_ID_TO_TABLE)}
+_TABLE_NAMES = _build_soa("table")
+_SEARCH_FIELDS = _build_soa("search_fields")
+_SELECT_COLS = _build_soa("select_cols")
+_DATE_FIELDS = _build_soa("date_field")
+_ORDER_FIELDS = _build_soa("order_field")
+
+# Per-table .or_ filter template, specialized at import: the per-call work
+# shrinks to one str.format (the sanitizer guarantees the search term holds
+# no braces or DSL metacharacters).
+_OR_TEMPLATES = tuple(
+    ",".join(f"{field}.ilike.%{{q}}%" for field in fields) for fields in _SEARCH_FIELDS
+)
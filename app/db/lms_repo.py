@@ -1,9 +1,29 @@
 from typing import Any, List, Dict
 from app.db.supabase import get_edify_supabase_client
+from app.core.config import settings
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# The query is interpolated into PostgREST's filter mini-DSL; characters
+# like , % * ( ) would be parsed as syntax there. Whitelist word chars,
+# whitespace and hyphens, and cap the length (same sanitizer as CRM/RMS).
+_UNSAFE_QUERY_CHARS_RE = re.compile(r'[^\w\s-]')
+_MAX_TEXT_QUERY_LEN = 64
+
+
+def _sanitize_text_query(text_query: str) -> str:
+    """Strips PostgREST/LIKE metacharacters and bounds the search term."""
+    return _UNSAFE_QUERY_CHARS_RE.sub('', text_query)[:_MAX_TEXT_QUERY_LEN].strip()
+
+
+# .or_ filter template built once at import; per call it is one str.format
+_OR_TEMPLATE = (
+    "name.ilike.%{q}%,title.ilike.%{q}%,description.ilike.%{q}%,"
+    "instructor.ilike.%{q}%,course_name.ilike.%{q}%"
+)
+
 class LMSRepo:
     """
     Repository for LMS data access.
@@ -11,6 +31,10 @@ class LMSRepo:
     Contains NO business logic - only data retrieval.
     """
     
+    # Only the columns the chatbot actually renders (id + searchable fields
+    # + date), so wide batch rows are never shipped over the wire.
+    SELECT_COLS = "id,name,title,description,instructor,course_name,created_at"
+
     def __init__(self):
         self.supabase = get_edify_supabase_client()
         self.table = "lms_batches"
@@ -27,15 +51,24 @@ class LMSRepo:
             List of LMS batch records (raw data from Supabase)
         """
         try:
+            # A 1-2 char term forces a %q% seq scan over the whole table and
+            # matches half of it; not a meaningful search, so skip the trip
+            text_query = _sanitize_text_query(query)
+            if len(text_query) < 3:
+                logger.info(f"Ignoring too-short LMS query: '{query}'")
+                return []
+
             # Use Supabase ilike for case-insensitive text search
             # Search across common LMS fields
-            response = (
-                self.supabase.table(self.table)
-                .select("*")
-                .or_(f"name.ilike.%{query}%,title.ilike.%{query}%,description.ilike.%{query}%,instructor.ilike.%{query}%,course_name.ilike.%{query}%")
-                .limit(10)
-                .execute()
-            )
+            query_builder = self.supabase.table(self.table).select(self.SELECT_COLS)
+            if settings.ENABLE_LMS_TRGM:
+                # pg_trgm-indexed blob of the searchable fields (see the
+                # lms_batches section of edify_trgm.sql): same substring
+                # semantics as the OR chain, but one index-accelerated ILIKE
+                query_builder = query_builder.ilike("search_blob", f"%{text_query}%")
+            else:
+                query_builder = query_builder.or_(_OR_TEMPLATE.format(q=text_query))
+            response = query_builder.limit(10).execute()
             
             logger.info(f"Retrieved {len(response.data)} LMS records")
             return response.data if response.data else []
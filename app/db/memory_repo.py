@@ -34,7 +34,8 @@ class MemoryRepo:
         cache_key = cache_key_chat_history(session_id)
         cached = get_cached(cache_key)
         if cached is not None:
-            logger.debug(f"Cache hit for chat history: {session_id[:8]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cache hit for chat history: {session_id[:8]}...")
             return cached
         
         try:
@@ -50,25 +51,24 @@ class MemoryRepo:
             if not response.data:
                 return []
             
-            # Convert pairs to individual messages in chronological order
+            # Convert pairs to individual messages in chronological order.
+            # [::-1] reverses in one C-level copy (the DESC query correctly
+            # fetched the *last* N pairs; they just arrive newest-first),
+            # and extend() adds both roles per pair in a single call.
             messages = []
-            # Reverse to get chronological order (oldest first)
-            for pair in reversed(response.data):
-                # Add user message
-                messages.append({
-                    "role": "admin",
-                    "content": pair["user_message"]
-                })
-                # Add assistant response
-                messages.append({
-                    "role": "assistant",
-                    "content": pair["assistant_response"]
-                })
+            for pair in response.data[::-1]:
+                messages.extend((
+                    {"role": "admin", "content": pair["user_message"]},
+                    {"role": "assistant", "content": pair["assistant_response"]},
+                ))
             
-            # Optional: Cache the result (non-breaking if cache fails)
+            # Optional: Cache the result (non-breaking if cache fails).
+            # Empty histories never reach this point (early return above),
+            # so no cache writes are spent on brand-new sessions.
             set_cached(cache_key, messages)
-            
-            logger.debug(f"Loaded {len(messages)} messages from chat_history for session {session_id[:8]}...")
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Loaded {len(messages)} messages from chat_history for session {session_id[:8]}...")
             return messages
             
         except Exception as e:
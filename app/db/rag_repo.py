@@ -1,10 +1,30 @@
 from typing import List, Dict, Any, Optional
 from app.db.supabase import get_chatbot_supabase_client
+from app.core.config import settings
+from app.utils.semantic_cache import rag_query_cache
+import asyncio
 import logging
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Rows per insert request: large enough that round-trips stop mattering,
+# small enough to stay under PostgREST's request payload limits even with
+# 1536-float embedding vectors attached.
+_INSERT_BATCH_SIZE = 200
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    """
+    Formats an embedding as a compact pgvector literal string.
+
+    The vector column stores float4, so 7 significant digits round-trip
+    losslessly while roughly halving the JSON payload compared to the
+    full-precision floats Python would serialize by default.
+    """
+    return "[" + ",".join(f"{x:.7g}" for x in embedding) + "]"
+
+
 class RAGRepo:
     """
     Repository for RAG data access.
@@ -29,6 +49,14 @@ class RAGRepo:
             True if any chunks from this file exist, False otherwise
         """
         try:
+            # Optional RPC path: SELECT EXISTS stops at the first matching
+            # chunk and returns one boolean instead of a row
+            if settings.ENABLE_RAG_RPC:
+                result = self.supabase.rpc(
+                    "rag_document_exists", {"name": file_name}
+                ).execute()
+                return bool(result.data)
+
             # Check if any chunks exist for this file
             # Chunks are stored as "filename.pdf::chunk_1", "filename.pdf::chunk_2", etc.
             response = (
@@ -38,13 +66,55 @@ class RAGRepo:
                 .limit(1)
                 .execute()
             )
-            
+
             return len(response.data) > 0
             
         except Exception as e:
             logger.error(f"Error checking document existence: {e}", exc_info=True)
             return False
 
+    def filter_new_files(self, file_names: List[str]) -> List[str]:
+        """
+        Returns the subset of file_names not yet ingested, using one query
+        instead of a document_exists round-trip per file.
+
+        Every ingested file has a "<name>::chunk_1" row, so an exact IN
+        match over those names finds the existing ones in a single
+        (index-friendly) request.
+
+        Args:
+            file_names: Candidate file names, order preserved in the result
+
+        Returns:
+            File names with no chunks stored yet; on error, all of them
+            (callers fall back to the per-file check)
+        """
+        try:
+            if not file_names:
+                return []
+
+            response = (
+                self.supabase.table(self.documents_table)
+                .select("file_name")
+                .in_("file_name", [f"{name}::chunk_1" for name in file_names])
+                .execute()
+            )
+
+            suffix_len = len("::chunk_1")
+            existing = {row["file_name"][:-suffix_len] for row in response.data}
+            return [name for name in file_names if name not in existing]
+
+        except Exception as e:
+            logger.error(f"Error batch-checking document existence: {e}", exc_info=True)
+            return list(file_names)
+
+    async def document_exists_async(self, file_name: str) -> bool:
+        """
+        Async variant of document_exists. Runs the sync Supabase client on
+        a worker thread so async callers don't block the event loop.
+        """
+        return await asyncio.to_thread(self.document_exists, file_name)
+
     def create_document(self, file_name: str, content: str) -> Optional[str]:
         """
         Create a new document record.
@@ -94,7 +164,7 @@ class RAGRepo:
                 self.supabase.table(self.embeddings_table)
                 .insert({
                     "document_id": document_id,
-                    "embedding": embedding
+                    "embedding": _vector_literal(embedding)
                 })
                 .execute()
             )
@@ -141,53 +211,88 @@ class RAGRepo:
                 logger.warning(f"Token counts length mismatch, ignoring token counts")
                 token_counts = None
             
-            # Create document records and embeddings in batch
-            # Each chunk becomes a document entry with its embedding
-            records = []
-            for chunk_idx, (chunk, embedding) in enumerate(zip(content_chunks, embeddings)):
-                # Create document record for this chunk
+            # Optional single-call path: the create_rag_chunks function
+            # (see chatbot_rag_rpc.sql) inserts documents and embeddings in
+            # one server-side transaction, so the whole file is one REST
+            # round-trip and partial ingests roll back atomically.
+            if settings.ENABLE_RAG_RPC:
+                payload = []
+                for chunk_idx, (chunk, embedding) in enumerate(zip(content_chunks, embeddings)):
+                    item = {
+                        "file_name": f"{file_name}::chunk_{chunk_idx + 1}",
+                        "content": chunk,
+                        "embedding": _vector_literal(embedding)
+                    }
+                    if token_counts is not None:
+                        item["token_count"] = token_counts[chunk_idx]
+                    payload.append(item)
+
+                result = self.supabase.rpc("create_rag_chunks", {"payload": payload}).execute()
+                inserted = result.data if isinstance(result.data, int) else 0
+                if inserted == len(content_chunks):
+                    logger.info(f"Created {inserted} document-embedding pairs for {file_name} (RPC)")
+                    rag_query_cache.clear()
+                    return True
+                logger.error(f"RPC ingest created {inserted}/{len(content_chunks)} pairs for {file_name}")
+                return False
+
+            # Batched writes: one insert per table (chunked to respect
+            # PostgREST payload limits) instead of two round-trips per chunk.
+            # Each chunk becomes a document entry with its embedding.
+            docs_payload = []
+            for chunk_idx, chunk in enumerate(content_chunks):
                 # Use file_name with chunk index to make it unique
-                chunk_file_name = f"{file_name}::chunk_{chunk_idx + 1}"
-                
-                # Prepare document data
                 doc_data = {
-                    "file_name": chunk_file_name,
+                    "file_name": f"{file_name}::chunk_{chunk_idx + 1}",
                     "content": chunk
                 }
-                
+
                 # Add token count if provided
                 if token_counts is not None:
                     doc_data["token_count"] = token_counts[chunk_idx]
-                
-                # Insert document
+
+                docs_payload.append(doc_data)
+
+            # Insert all document rows; PostgREST returns the inserted rows
+            # in insertion order, so positions line up with the embeddings
+            created_docs = []
+            for start in range(0, len(docs_payload), _INSERT_BATCH_SIZE):
                 doc_response = (
                     self.supabase.table(self.documents_table)
-                    .insert(doc_data)
+                    .insert(docs_payload[start:start + _INSERT_BATCH_SIZE])
                     .execute()
                 )
-                
-                if not doc_response.data:
-                    logger.error(f"Failed to create document record for chunk {chunk_idx + 1}")
-                    continue
-                
-                doc_id = doc_response.data[0]["id"]
-                
-                # Insert embedding
+                if doc_response.data:
+                    created_docs.extend(doc_response.data)
+
+            if len(created_docs) != len(content_chunks):
+                logger.error(
+                    f"Created {len(created_docs)}/{len(content_chunks)} document records for {file_name}"
+                )
+
+            # Insert all embedding rows keyed by the returned document ids
+            emb_payload = [
+                {"document_id": doc_row["id"], "embedding": _vector_literal(embedding)}
+                for doc_row, embedding in zip(created_docs, embeddings)
+            ]
+            records = []
+            for start in range(0, len(emb_payload), _INSERT_BATCH_SIZE):
                 emb_response = (
                     self.supabase.table(self.embeddings_table)
-                    .insert({
-                        "document_id": doc_id,
-                        "embedding": embedding
-                    })
+                    .insert(emb_payload[start:start + _INSERT_BATCH_SIZE])
                     .execute()
                 )
-                
                 if emb_response.data:
-                    records.append((chunk_idx + 1, doc_id))
-            
+                    records.extend(emb_response.data)
+
+            if records:
+                # New content is searchable now, so cached query results
+                # from before the ingest may be incomplete
+                rag_query_cache.clear()
+
             if len(records) == len(content_chunks):
                 total_tokens = sum(token_counts) if token_counts else 0
-                logger.info(f"Created {len(records)} document-embedding pairs for {file_name}" + 
+                logger.info(f"Created {len(records)} document-embedding pairs for {file_name}" +
                           (f" (total tokens: {total_tokens})" if total_tokens > 0 else ""))
                 return True
             else:
@@ -198,6 +303,22 @@ class RAGRepo:
             logger.error(f"Error creating document with embeddings: {e}", exc_info=True)
             return False
 
+    async def create_document_with_embeddings_async(
+        self,
+        file_name: str,
+        content_chunks: List[str],
+        embeddings: List[List[float]],
+        token_counts: List[int] = None
+    ) -> bool:
+        """
+        Async variant of create_document_with_embeddings, offloaded to a
+        worker thread for the duration of the insert round-trips.
+        """
+        return await asyncio.to_thread(
+            self.create_document_with_embeddings,
+            file_name, content_chunks, embeddings, token_counts
+        )
+
     def get_document_by_name(self, file_name: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a document by file name.
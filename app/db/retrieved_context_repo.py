@@ -1,7 +1,8 @@
 from typing import List, Dict, Any, Optional
 from app.db.supabase import get_chatbot_supabase_client
+from app.db._uuid import normalize_admin_id
+import asyncio
 import logging
-import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -44,27 +45,21 @@ class RetrievedContextRepo:
             True if successful, False otherwise
         """
         try:
-            # Convert admin_id to UUID if needed
-            if admin_id == "anonymous" or not admin_id:
-                admin_uuid = "00000000-0000-0000-0000-000000000000"
-            else:
-                try:
-                    admin_uuid = str(uuid.UUID(admin_id))
-                except ValueError:
-                    admin_uuid = "00000000-0000-0000-0000-000000000000"
+            admin_uuid = normalize_admin_id(admin_id)
             
-            # Auto-calculate record count if not provided
+            # Auto-calculate record count if not provided (single pass over
+            # the payload shape, no repeated membership/type checks)
             if record_count is None:
                 if error_message:
                     record_count = 0
+                elif isinstance(payload, list):
+                    record_count = len(payload)
                 elif isinstance(payload, dict):
-                    # Try to get count from payload
-                    if "data" in payload and isinstance(payload["data"], list):
-                        record_count = len(payload["data"])
+                    data_items = payload.get("data")
+                    if isinstance(data_items, list):
+                        record_count = len(data_items)
                     else:
                         record_count = 1 if payload else 0
-                elif isinstance(payload, list):
-                    record_count = len(payload)
                 else:
                     record_count = 1 if payload else 0
             
@@ -95,7 +90,14 @@ class RetrievedContextRepo:
         except Exception as e:
             logger.error(f"Error saving retrieved context: {e}", exc_info=True)
             return False
-    
+
+    async def save_context_async(self, *args, **kwargs) -> bool:
+        """
+        Async variant of save_context. Runs the sync Supabase client on a
+        worker thread so async callers don't block the event loop.
+        """
+        return await asyncio.to_thread(self.save_context, *args, **kwargs)
+
     def get_context_by_session(
         self, 
         session_id: str, 
@@ -147,11 +149,7 @@ class RetrievedContextRepo:
             List of context records
         """
         try:
-            # Convert admin_id to UUID if needed
-            try:
-                admin_uuid = str(uuid.UUID(admin_id))
-            except ValueError:
-                admin_uuid = "00000000-0000-0000-0000-000000000000"
+            admin_uuid = normalize_admin_id(admin_id)
             
             query = (
                 self.supabase.table(self.table)
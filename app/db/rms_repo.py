@@ -1,11 +1,119 @@
 from typing import Any, List, Dict, Optional
 from app.db.supabase import get_edify_supabase_client
+from app.core.config import settings
+import asyncio
 import logging
 from datetime import datetime, timedelta
 import re
 
 logger = logging.getLogger(__name__)
 
+# Table detection keywords with comprehensive synonyms (LENIENT matching).
+# Intent detection mirrors CRMRepo: tokenize the query once and look each
+# token up in a dict (word boundaries come free with whole-word tokens),
+# with one small compiled alternation for the multi-word synonyms
+# ("job opening", "to do", ...) instead of re-scanning the query per keyword.
+_TABLE_KEYWORDS = {
+    "job_openings": ["job opening", "job openings", "opening", "openings", "position", "positions",
+                     "vacancy", "vacancies", "job", "jobs", "role", "roles", "hiring", "recruitment"],
+    "candidates": ["candidate", "candidates", "applicant", "applicants", "prospect", "prospects"],
+    "companies": ["company", "companies", "organization", "organizations", "org", "orgs",
+                  "employer", "employers", "client", "clients"],
+    "interviews": ["interview", "interviews", "screening", "screenings", "meeting", "meetings"],
+    "tasks": ["task", "tasks", "todo", "todos", "to-do", "to do", "assignment", "assignments"]
+}
+_KEYWORD_TO_TABLE = {
+    kw: table for table, kws in _TABLE_KEYWORDS.items() for kw in kws
+}
+_WORD_RE = re.compile(r'\w+')
+_SINGLE_KEYWORD_TO_TABLE = {
+    kw: table for kw, table in _KEYWORD_TO_TABLE.items() if _WORD_RE.fullmatch(kw)
+}
+_PHRASE_KEYWORD_RE = re.compile(
+    r'\b(?:'
+    + '|'.join(sorted(
+        (re.escape(kw) for kw in _KEYWORD_TO_TABLE if not _WORD_RE.fullmatch(kw)),
+        key=len, reverse=True))
+    + r')\b'
+)
+
+# Common query words that don't represent actual search terms.
+_QUERY_STOPWORDS = (
+    # Date keywords
+    'today', 'yesterday', 'this week', 'new', 'recent',
+    # Action verbs
+    'show', 'shows', 'display', 'get', 'give', 'list', 'find', 'fetch', 'search',
+    'see', 'view', 'tell', 'provide', 'return', 'bring',
+    # Pronouns and filler words
+    'me', 'my', 'i', 'want', 'need', 'please', 'can', 'could', 'would',
+    # System keywords
+    'rms', 'data', 'details', 'information', 'info', 'record', 'records',
+    # Articles and determiners
+    'all', 'the', 'a', 'an', 'some', 'any', 'every', 'each',
+    # Verb forms
+    's', 'is', 'are', 'was', 'were', 'have', 'has', 'had',
+    # Entity names (will be detected separately)
+    'job', 'jobs', 'opening', 'openings', 'candidate', 'candidates',
+    'company', 'companies', 'interview', 'interviews', 'task', 'tasks',
+    'position', 'positions', 'role', 'roles',
+    # Common connectors
+    'out', 'of', 'in', 'from', 'with', 'for', 'to'
+)
+# Single alternation (longest first, so "candidates" wins over "candidate"):
+# one linear sub pass removes every stopword instead of rewriting the whole
+# string once per keyword. A set-lookup tokenizer was considered but the
+# alternation preserves the original casing/punctuation of what remains and
+# handles the multi-word stopword "this week" without bigram bookkeeping.
+_STOPWORDS_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted(map(re.escape, _QUERY_STOPWORDS), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+# text_query is interpolated into PostgREST's filter mini-DSL; characters
+# like , % * ( ) would be parsed as syntax there. Whitelist word chars,
+# whitespace and hyphens, and cap the length so adversarial input cannot
+# produce pathological LIKE patterns on the Postgres side.
+_UNSAFE_QUERY_CHARS_RE = re.compile(r'[^\w\s-]')
+_MAX_TEXT_QUERY_LEN = 64
+
+
+def _sanitize_text_query(text_query: str) -> str:
+    """Strips PostgREST/LIKE metacharacters and bounds the search term."""
+    return _UNSAFE_QUERY_CHARS_RE.sub('', text_query)[:_MAX_TEXT_QUERY_LEN].strip()
+
+
+# Date keyword patterns, compiled once instead of per _parse_date_filters call
+# (same treatment CRMRepo received; the RMS parser is a sibling copy).
+_TODAY_RE = re.compile(r'\btoday\b')
+_YESTERDAY_RE = re.compile(r'\byesterday\b')
+_THIS_WEEK_RE = re.compile(r'\bthis week\b')
+_NEW_RE = re.compile(r'\bnew\b')
+
+# Patterns that indicate "get all" intent (LENIENT matching), compiled once
+_LIST_QUERY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # "all [entity]" patterns
+    r'\ball\s+(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
+    # "[entity] details/info/data" patterns
+    r'(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)\s+(?:details?|information|info|data)',
+    # "list [entity]" patterns
+    r'list\s+(?:out\s+)?(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
+    # "show [entity]" patterns
+    r'show\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
+    # "get [entity]" patterns
+    r'get\s+(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
+    # "give [entity]" patterns
+    r'give\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
+    # "display [entity]" patterns
+    r'display\s+(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
+    # Just entity name alone (e.g., "candidates", "job openings")
+    r'^(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)$',
+    # "rms [entity]" or "[entity] in rms"
+    r'(?:rms\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)(?:\s+in\s+rms)?',
+    # "rms data" or "rms information"
+    r'rms\s+(?:data|information|info)'
+))
+
+
 class RMSRepo:
     """
     Repository for RMS data access.
@@ -15,34 +123,41 @@ class RMSRepo:
     """
     
     # Table configurations with exact field names from Edify RMS schema
+    # select_cols lists only the columns the chatbot actually renders
+    # (id + searchable fields + date), so wide rows are never shipped.
     TABLE_CONFIGS = {
         "job_openings": {
             "table": "job_openings",
             "search_fields": ["job_title", "job_type", "industry", "department", "city", "country", "state", "job_status", "location"],
+            "select_cols": "id,job_title,job_type,industry,department,city,country,state,job_status,location,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "candidates": {
             "table": "candidates",
             "search_fields": ["candidate_name", "job_title", "industry", "email", "mobile", "department_name", "city", "country", "state", "candidate_status", "current_job_title"],
+            "select_cols": "id,candidate_name,job_title,industry,email,mobile,department_name,city,country,state,candidate_status,current_job_title,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "companies": {
             "table": "companies",
             "search_fields": ["company_name", "email", "phone", "city", "country", "state", "status", "vendor_name"],
+            "select_cols": "id,company_name,email,phone,city,country,state,status,vendor_name,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "interviews": {
             "table": "interviews",
             "search_fields": ["job_title", "interview_name", "interview_type", "interview_owner", "location", "status", "interview_status"],
+            "select_cols": "id,job_title,interview_name,interview_type,interview_owner,location,status,interview_status,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         },
         "tasks": {
             "table": "tasks",
             "search_fields": ["subject", "priority", "status", "task_type"],
+            "select_cols": "id,subject,priority,status,task_type,created_at",
             "date_field": "created_at",
             "order_field": "created_at"
         }
@@ -51,52 +166,46 @@ class RMSRepo:
     def __init__(self):
         self.supabase = get_edify_supabase_client()
     
-    def _detect_table_intent(self, query: str) -> Optional[str]:
+    def _detect_table_intent(self, query: str, query_lower: Optional[str] = None) -> Optional[str]:
         """
         Detects which RMS table the user wants to query based on keywords.
         Uses LENIENT matching with synonyms and variations.
         Returns table key or "candidates" as default.
         """
-        query_lower = query.lower()
-        
-        # Table detection keywords with comprehensive synonyms (LENIENT matching)
-        table_keywords = {
-            "job_openings": ["job opening", "job openings", "opening", "openings", "position", "positions", 
-                           "vacancy", "vacancies", "job", "jobs", "role", "roles", "hiring", "recruitment"],
-            "candidates": ["candidate", "candidates", "applicant", "applicants", "prospect", "prospects"],
-            "companies": ["company", "companies", "organization", "organizations", "org", "orgs", 
-                         "employer", "employers", "client", "clients"],
-            "interviews": ["interview", "interviews", "screening", "screenings", "meeting", "meetings"],
-            "tasks": ["task", "tasks", "todo", "todos", "to-do", "to do", "assignment", "assignments"]
-        }
-        
-        # Count matches for each table
-        table_scores = {table: 0 for table in self.TABLE_CONFIGS.keys()}
-        
-        for table, keywords in table_keywords.items():
-            for keyword in keywords:
-                if re.search(rf'\b{keyword}\b', query_lower):
-                    table_scores[table] += 1
-        
-        # Find table with highest score
-        max_score = max(table_scores.values())
-        if max_score == 0:
+        if query_lower is None:
+            query_lower = query.lower()
+
+        # Count matches for each table: one token pass + one phrase scan
+        table_scores = {}
+
+        for token in _WORD_RE.findall(query_lower):
+            table = _SINGLE_KEYWORD_TO_TABLE.get(token)
+            if table is not None:
+                table_scores[table] = table_scores.get(table, 0) + 1
+
+        for match in _PHRASE_KEYWORD_RE.finditer(query_lower):
+            table = _KEYWORD_TO_TABLE[match.group()]
+            table_scores[table] = table_scores.get(table, 0) + 1
+
+        if not table_scores:
             # No specific table mentioned, default to candidates
             return "candidates"
-        
-        # Return table with highest score
-        for table, score in table_scores.items():
-            if score == max_score:
+
+        # Return table with highest score (config order wins ties)
+        max_score = max(table_scores.values())
+        for table in self.TABLE_CONFIGS:
+            if table_scores.get(table) == max_score:
                 return table
-        
+
         return "candidates"  # Default fallback
     
-    def _parse_date_filters(self, query: str) -> Dict[str, Any]:
+    def _parse_date_filters(self, query: str, query_lower: Optional[str] = None) -> Dict[str, Any]:
         """
         Parses date-related keywords from the query string.
         Returns a dict with date filter information.
         """
-        query_lower = query.lower()
+        if query_lower is None:
+            query_lower = query.lower()
         filters = {
             "start_date": None,
             "end_date": None,
@@ -104,31 +213,35 @@ class RMSRepo:
             "text_query": None
         }
         
-        # Get today's date range (start and end of day)
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999)
+        # Get today's date range (start and end of day) from a single clock
+        # read - three separate now() calls could even straddle midnight
+        now = datetime.now()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
         
+        # Each regex runs only after a C-level substring check - most queries
+        # carry no date keyword at all, so the common case never enters sre.
         # Check for "today" keyword
-        if re.search(r'\btoday\b', query_lower):
+        if 'today' in query_lower and _TODAY_RE.search(query_lower):
             filters["start_date"] = today_start
             filters["end_date"] = today_end
-        
+
         # Check for "yesterday" keyword
-        elif re.search(r'\byesterday\b', query_lower):
+        elif 'yesterday' in query_lower and _YESTERDAY_RE.search(query_lower):
             yesterday_start = today_start - timedelta(days=1)
             yesterday_end = today_end - timedelta(days=1)
             filters["start_date"] = yesterday_start
             filters["end_date"] = yesterday_end
-        
+
         # Check for "this week" keyword
-        elif re.search(r'\bthis week\b', query_lower):
-            days_since_monday = datetime.now().weekday()
+        elif 'this week' in query_lower and _THIS_WEEK_RE.search(query_lower):
+            days_since_monday = now.weekday()
             week_start = today_start - timedelta(days=days_since_monday)
             filters["start_date"] = week_start
             filters["end_date"] = today_end
-        
+
         # Check for "new" keyword (typically means recent, e.g., last 7 days)
-        if re.search(r'\bnew\b', query_lower):
+        if 'new' in query_lower and _NEW_RE.search(query_lower):
             filters["is_new"] = True
             # If no other date filter, default "new" to last 7 days
             if filters["start_date"] is None:
@@ -136,65 +249,18 @@ class RMSRepo:
                 filters["end_date"] = today_end
         
         # STEP 3: Detect if this is a LIST/GET/SHOW query (should return all records)
-        # Patterns that indicate "get all" intent (LENIENT matching)
-        list_query_patterns = [
-            # "all [entity]" patterns
-            r'\ball\s+(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
-            # "[entity] details/info/data" patterns
-            r'(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)\s+(?:details?|information|info|data)',
-            # "list [entity]" patterns
-            r'list\s+(?:out\s+)?(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
-            # "show [entity]" patterns
-            r'show\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
-            # "get [entity]" patterns
-            r'get\s+(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
-            # "give [entity]" patterns
-            r'give\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
-            # "display [entity]" patterns
-            r'display\s+(?:all\s+)?(?:the\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)',
-            # Just entity name alone (e.g., "candidates", "job openings")
-            r'^(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)$',
-            # "rms [entity]" or "[entity] in rms"
-            r'(?:rms\s+)?(?:job\s+openings?|candidates?|companies?|interviews?|tasks?|positions?|roles?)(?:\s+in\s+rms)?',
-            # "rms data" or "rms information"
-            r'rms\s+(?:data|information|info)'
-        ]
-        
-        is_list_query = any(re.search(pattern, query_lower) for pattern in list_query_patterns)
+        is_list_query = any(pattern.search(query_lower) for pattern in _LIST_QUERY_PATTERNS)
         
         # STEP 4: Extract text query ONLY if this is NOT a list query
         # For list queries, we return all records without text filtering
         if not is_list_query:
-            text_query = query
             # Remove common query words that don't represent actual search terms
-            query_words = [
-                # Date keywords
-                'today', 'yesterday', 'this week', 'new', 'recent',
-                # Action verbs
-                'show', 'shows', 'display', 'get', 'give', 'list', 'find', 'fetch', 'search',
-                'see', 'view', 'tell', 'provide', 'return', 'bring',
-                # Pronouns and filler words
-                'me', 'my', 'i', 'want', 'need', 'please', 'can', 'could', 'would',
-                # System keywords
-                'rms', 'data', 'details', 'information', 'info', 'record', 'records',
-                # Articles and determiners
-                'all', 'the', 'a', 'an', 'some', 'any', 'every', 'each',
-                # Verb forms
-                's', 'is', 'are', 'was', 'were', 'have', 'has', 'had',
-                # Entity names (will be detected separately)
-                'job', 'jobs', 'opening', 'openings', 'candidate', 'candidates',
-                'company', 'companies', 'interview', 'interviews', 'task', 'tasks',
-                'position', 'positions', 'role', 'roles',
-                # Common connectors
-                'out', 'of', 'in', 'from', 'with', 'for', 'to'
-            ]
-            for keyword in query_words:
-                text_query = re.sub(rf'\b{keyword}\b', '', text_query, flags=re.IGNORECASE)
+            text_query = _STOPWORDS_RE.sub('', query)
             text_query = ' '.join(text_query.split())  # Clean up extra spaces
-            
+
             # Only use as text query if there's meaningful content left (more than 2 chars)
-            if text_query.strip() and len(text_query.strip()) > 2:
-                filters["text_query"] = text_query.strip()
+            if text_query and len(text_query) > 2:
+                filters["text_query"] = text_query
         
         return filters
     
@@ -207,7 +273,7 @@ class RMSRepo:
         date_field = table_config["date_field"]
         order_field = table_config["order_field"]
         
-        query_builder = self.supabase.table(table_name).select("*")
+        query_builder = self.supabase.table(table_name).select(table_config["select_cols"])
         
         # Apply date filters if present
         if filters["start_date"] and filters["end_date"]:
@@ -224,13 +290,17 @@ class RMSRepo:
         text_query_applied = False
         if filters.get("text_query"):
             # Validate text query is meaningful (not just leftover words)
-            text_query = filters["text_query"].strip()
+            text_query = _sanitize_text_query(filters["text_query"])
             # Only apply if it's longer than 2 chars and not a common word
             common_words = {'out', 'the', 'all', 'me', 'my', 'i', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'of', 'for', 'to', 'with'}
             if len(text_query) > 2 and text_query.lower() not in common_words:
-                # Build OR condition for all search fields
-                or_conditions = ",".join([f"{field}.ilike.%{text_query}%" for field in search_fields])
-                query_builder = query_builder.or_(or_conditions)
+                if settings.ENABLE_RMS_TRGM:
+                    # One trigram-indexed scan over the generated search_blob
+                    # column (see edify_trgm.sql) instead of an OR fan-out
+                    query_builder = query_builder.ilike("search_blob", f"%{text_query}%")
+                else:
+                    # OR condition over all search fields (template built at import)
+                    query_builder = query_builder.or_(_OR_TEMPLATES[table_name].format(q=text_query))
                 logger.info(f"Applied text search: {text_query}")
                 text_query_applied = True
             else:
@@ -263,14 +333,17 @@ class RMSRepo:
             List of RMS records (raw data from Supabase)
         """
         try:
+            # Lowercase once and share the result with both helpers
+            query_lower = query.lower()
+
             # Detect which table to query
-            table_key = self._detect_table_intent(query)
+            table_key = self._detect_table_intent(query, query_lower)
             table_config = self.TABLE_CONFIGS[table_key]
-            
+
             logger.info(f"Detected RMS table: {table_key} (table: {table_config['table']})")
-            
+
             # Parse filters
-            filters = self._parse_date_filters(query)
+            filters = self._parse_date_filters(query, query_lower)
             
             # Build and execute query
             data = self._build_query(table_config, filters, limit=50)
@@ -290,7 +363,15 @@ class RMSRepo:
             except Exception as fallback_error:
                 logger.error(f"Fallback search also failed: {fallback_error}", exc_info=True)
                 return []
-    
+
+    async def search_rms_async(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Async variant of search_rms for use inside async handlers/nodes.
+        Runs the sync Supabase client on a worker thread so the event loop
+        is not blocked for the duration of the round-trip.
+        """
+        return await asyncio.to_thread(self.search_rms, query)
+
     def get_all_job_openings(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all job openings."""
         return self._get_all_from_table("job_openings", limit)
@@ -320,3 +401,11 @@ class RMSRepo:
         except Exception as e:
             logger.error(f"Error getting all from {table_key}: {e}", exc_info=True)
             return []
+
+
+# Per-table .or_ filter template, specialized at import (keyed by table
+# name): the per-call work shrinks to one str.format, matching CRMRepo.
+_OR_TEMPLATES = {
+    cfg["table"]: ",".join(f"{field}.ilike.%{{q}}%" for field in cfg["search_fields"])
+    for cfg in RMSRepo.TABLE_CONFIGS.values()
+}
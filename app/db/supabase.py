@@ -1,5 +1,7 @@
 # app/db/supabase.py
 
+from contextlib import contextmanager
+from functools import lru_cache
 from supabase import create_client, Client
 from app.core.config import settings
 import logging
@@ -9,86 +11,136 @@ logger = logging.getLogger(__name__)
 
 # Optional: Connection pool configuration (if enabled)
 def _get_client_options():
-    """Get optional client options for connection pooling."""
+    """Get optional client options for connection pooling / timeouts."""
     if settings.ENABLE_CONNECTION_POOLING:
         try:
             from supabase.client import ClientOptions
             return ClientOptions(
-                # Note: Supabase Python client uses httpx internally
-                # Connection pooling is handled by httpx connection pool
-                # These options are passed through if supported
+                # Note: Supabase Python client uses httpx internally.
+                # The postgrest timeout is the main knob ClientOptions exposes;
+                # pool sizing is applied separately in _apply_pool_limits.
+                postgrest_client_timeout=settings.REQUEST_TIMEOUT_SECONDS,
             )
-        except ImportError:
+        except (ImportError, TypeError):
             logger.debug("ClientOptions not available in this supabase version")
     return None
 
-# Separate clients for Edify (read-only) and Chatbot (read/write)
-_edify_supabase_client: Client | None = None
-_chatbot_supabase_client: Client | None = None
 
+def _apply_pool_limits(client: Client) -> Client:
+    """
+    Re-creates the postgrest httpx session with explicit pool limits.
 
-def _ensure_no_proxy_env():
+    supabase-py does not expose pool sizing, so when ENABLE_CONNECTION_POOLING
+    is on this swaps the underlying httpx.Client for one with bounded
+    max_connections / keep-alive (wired to settings.MAX_CONNECTIONS) while
+    preserving base_url and headers. Best-effort: any incompatibility with the
+    installed supabase version leaves the default session in place.
     """
-    Temporarily remove proxy environment variables to prevent gotrue proxy errors.
-    gotrue 2.8.1 may incorrectly handle proxy parameters.
+    if not settings.ENABLE_CONNECTION_POOLING:
+        return client
+
+    try:
+        import httpx
+
+        # HTTP/2 multiplexes concurrent PostgREST calls over one TCP+TLS
+        # connection; needs the optional h2 package (httpx[http2]).
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+
+        old_session = client.postgrest.session
+        client.postgrest.session = httpx.Client(
+            base_url=old_session.base_url,
+            headers=old_session.headers,
+            http2=http2,
+            timeout=settings.REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.MAX_CONNECTIONS,
+                max_keepalive_connections=32,
+                keepalive_expiry=300,
+            ),
+        )
+        old_session.close()
+        logger.info(f"Supabase pool limits applied (max_connections={settings.MAX_CONNECTIONS}, http2={http2})")
+    except Exception as e:
+        logger.debug(f"Could not apply pool limits to postgrest session: {e}")
+
+    return client
+
+
+_PROXY_VARS = ('HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy')
+
+
+@contextmanager
+def _proxy_env_stripped():
     """
-    proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-    saved = {}
-    for var in proxy_vars:
-        if var in os.environ:
-            saved[var] = os.environ.pop(var)
-    return saved
+    Temporarily removes proxy environment variables to prevent gotrue proxy
+    errors (gotrue 2.8.1 may incorrectly handle proxy parameters).
 
+    Mutation is bounded to the with-block and skipped entirely when no
+    proxy vars are set - the common case. Gated by STRIP_PROXY_ENV so the
+    workaround can be switched off once gotrue is upgraded.
+    """
+    if not settings.STRIP_PROXY_ENV or not any(var in os.environ for var in _PROXY_VARS):
+        yield
+        return
 
-def _restore_proxy_env(saved: dict):
-    """Restore proxy environment variables."""
-    os.environ.update(saved)
+    saved = {var: os.environ.pop(var) for var in _PROXY_VARS if var in os.environ}
+    try:
+        yield
+    finally:
+        os.environ.update(saved)
 
 
+def _build_client(url: str, key: str) -> Client:
+    """
+    Builds one configured Supabase client: proxy-env workaround, optional
+    ClientOptions, pool limits. Shared by both getters so the two code
+    paths cannot drift apart.
+    """
+    with _proxy_env_stripped():
+        options = _get_client_options()
+        if options is not None:
+            client = create_client(url, key, options=options)
+        else:
+            client = create_client(url, key)
+    return _apply_pool_limits(client)
+
+
+@lru_cache(maxsize=1)
 def get_edify_supabase_client() -> Client:
     """
     Returns a singleton Supabase client for Edify Production database.
     READ-ONLY access only - used for CRM, LMS, RMS data retrieval.
     Uses service_role key (backend-only).
-    """
-    global _edify_supabase_client
-
-    if _edify_supabase_client is None:
-        logger.info("Initializing Edify Supabase client (read-only)")
-        # Temporarily remove proxy env vars to prevent gotrue errors
-        saved_proxy = _ensure_no_proxy_env()
-        try:
-            _edify_supabase_client = create_client(
-                settings.EDIFY_SUPABASE_URL,
-                settings.EDIFY_SUPABASE_SERVICE_ROLE_KEY
-            )
-        finally:
-            _restore_proxy_env(saved_proxy)
 
-    return _edify_supabase_client
+    Memoized via lru_cache so the whole warm process reuses one client
+    (one TLS handshake / postgrest setup per process, not per call).
+    """
+    logger.info("Initializing Edify Supabase client (read-only)")
+    return _build_client(
+        settings.EDIFY_SUPABASE_URL,
+        settings.EDIFY_SUPABASE_SERVICE_ROLE_KEY,
+    )
 
 
+@lru_cache(maxsize=1)
 def get_chatbot_supabase_client() -> Client:
     """
     Returns a singleton Supabase client for Chatbot database.
     READ/WRITE access - used for sessions, memory, RAG, audit logs.
     Uses service_role key (backend-only).
-    """
-    global _chatbot_supabase_client
-
-    if _chatbot_supabase_client is None:
-        logger.info("Initializing Chatbot Supabase client (read/write)")
-        # Temporarily remove proxy env vars to prevent gotrue errors
-        saved_proxy = _ensure_no_proxy_env()
-        try:
-            _chatbot_supabase_client = create_client(
-                settings.CHATBOT_SUPABASE_URL,
-                settings.CHATBOT_SUPABASE_SERVICE_ROLE_KEY
-            )
-        finally:
-            _restore_proxy_env(saved_proxy)
 
-    return _chatbot_supabase_client
+    Memoized via lru_cache so the whole warm process reuses one client
+    (one TLS handshake / postgrest setup per process, not per call).
+    """
+    logger.info("Initializing Chatbot Supabase client (read/write)")
+    return _build_client(
+        settings.CHATBOT_SUPABASE_URL,
+        settings.CHATBOT_SUPABASE_SERVICE_ROLE_KEY,
+    )
 
 
 # Backward compatibility alias - defaults to Chatbot client
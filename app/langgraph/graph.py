@@ -49,23 +49,20 @@ workflow.add_conditional_edges(
 workflow.add_edge("load_memory", "decide_source")
 
 # Edge: Decide Source -> Fetch ...
+# Source-to-node dispatch table; unknown sources (general/none) go straight
+# to check_context
+_ROUTE_TABLE = {
+    "crm": "fetch_crm",
+    "lms": "fetch_lms",
+    "rms": "fetch_rms",
+    "rag": "fetch_rag",
+}
+
 def route_source(state: AgentState):
-    source = state.get("source_type", "general")
-    
     # If response already set (e.g., greeting), skip to check_context
     if state.get("response"):
         return "check_context"
-    
-    if source == "crm":
-        return "fetch_crm"
-    elif source == "lms":
-        return "fetch_lms"
-    elif source == "rms":
-        return "fetch_rms"
-    elif source == "rag":
-        return "fetch_rag"
-    else:
-        return "check_context" # Direct to check_context (which handles general/none)
+    return _ROUTE_TABLE.get(state.get("source_type"), "check_context")
 
 workflow.add_conditional_edges(
     "decide_source",
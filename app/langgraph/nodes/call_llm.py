@@ -1,11 +1,35 @@
 from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from app.langgraph.state import AgentState
+from app.langgraph.nodes.decide_source import is_greeting
 from app.llm.formatter import ResponseFormatter
 from app.db.audit_repo import AuditRepo
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Audit inserts on the error path run here so the user gets the fallback
+# response without waiting for the bookkeeping write
+_audit_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-audit")
+
+# is_greeting is a pure keyword check, so repeated queries can reuse the
+# verdict instead of rescanning the keyword list
+_is_greeting_cached = lru_cache(maxsize=2048)(is_greeting)
+
+
+@lru_cache(maxsize=1)
+def _get_formatter() -> ResponseFormatter:
+    """One formatter (and underlying OpenAI client) per process, built on
+    first use rather than per invocation."""
+    return ResponseFormatter()
+
+
+@lru_cache(maxsize=1)
+def _get_audit_repo() -> AuditRepo:
+    """One audit repo per process, built on first error rather than per one."""
+    return AuditRepo()
+
 def call_llm_node(state: AgentState) -> Dict[str, Any]:
     """
     Calls LLM to format response.
@@ -32,24 +56,25 @@ def call_llm_node(state: AgentState) -> Dict[str, Any]:
         
         # If no context and not a greeting, reject
         if is_context_empty:
-            from app.langgraph.nodes.decide_source import is_greeting
-            if not is_greeting(query):
-                logger.warning(f"Blocked LLM call without context for query: {query[:100]}")
+            if not _is_greeting_cached(query):
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(f"Blocked LLM call without context for query: {query[:100]}")
                 return {
                     "response": "I can only answer questions related to Edify CRM, LMS, RMS, or internal documents."
                 }
 
-        formatter = ResponseFormatter()
-        response = formatter.format_response(query, context, source)
+        response = _get_formatter().format_response(query, context, source)
         
         return {"response": response}
 
     except Exception as e:
         logger.error(f"Error calling LLM: {e}", exc_info=True)
-        # Persist error to audit log
+        # Persist error to audit log off-thread; the fallback response
+        # should not wait on the insert (log_action already swallows its
+        # own errors)
         try:
-            audit = AuditRepo()
-            audit.log_action(
+            _audit_pool.submit(
+                _get_audit_repo().log_action,
                 admin_id=admin_id,
                 action="llm_error",
                 details={
@@ -59,6 +84,6 @@ def call_llm_node(state: AgentState) -> Dict[str, Any]:
                 },
                 session_id=session_id
             )
-        except:
+        except Exception:
             pass
         return {"response": "I encountered an error generating the response."}
@@ -1,12 +1,47 @@
 from typing import Dict, Any
+from functools import lru_cache
 from app.langgraph.state import AgentState
 from app.db.retrieved_context_repo import RetrievedContextRepo
 from app.db.audit_repo import AuditRepo
 from app.langgraph.nodes.decide_source import is_greeting
+from app.utils.background import run_in_background
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=1)
+def _get_context_repo() -> RetrievedContextRepo:
+    return RetrievedContextRepo()
+
+
+@lru_cache(maxsize=1)
+def _get_audit_repo() -> AuditRepo:
+    return AuditRepo()
+
+
+def _persist_no_data(session_id, admin_id, source, query) -> None:
+    """Writes the no-data-found context row and audit entry. Runs on the
+    background write thread, off the response path."""
+    _get_context_repo().save_context(
+        session_id=session_id or "unknown",
+        admin_id=admin_id,
+        source_type=source or "none",
+        query_text=query,
+        payload={"status": "no_data_found"},  # Only store status, query is in query_text column
+        record_count=0,
+        error_message="No data found"
+    )
+    _get_audit_repo().log_action(
+        admin_id=admin_id,
+        action="no_data_found",
+        details={
+            "source_type": source,
+            "query": query
+        },
+        session_id=session_id
+    )
+
 def check_context_node(state: AgentState) -> Dict[str, Any]:
     """
     Checks if retrieved_context has data.
@@ -28,7 +63,8 @@ def check_context_node(state: AgentState) -> Dict[str, Any]:
     # HARD GATE: Block "general" queries that are not greetings
     if source == "general":
         if not is_greeting(user_message):
-            logger.warning(f"Blocked general knowledge query: {user_message[:100]}")
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(f"Blocked general knowledge query: {user_message[:100]}")
             return {
                 "response": "I can only answer questions related to Edify CRM, LMS, RMS, or internal documents."
             }
@@ -43,34 +79,12 @@ def check_context_node(state: AgentState) -> Dict[str, Any]:
         # No data found - this should be rare for valid CRM/LMS/RMS/RAG intents
         # Log this as it indicates a potential issue with data retrieval
         query = state.get("user_message", "")
-        logger.warning(f"No data found for {source} query: {query[:100]}")
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(f"No data found for {source} query: {query[:100]}")
         
-        # Persist this event for analysis
-        try:
-            context_repo = RetrievedContextRepo()
-            context_repo.save_context(
-                session_id=session_id or "unknown",
-                admin_id=admin_id,
-                source_type=source or "none",
-                query_text=query,
-                payload={"status": "no_data_found"},  # Only store status, query is in query_text column
-                record_count=0,
-                error_message="No data found"
-            )
-            
-            # Audit log no data found
-            audit = AuditRepo()
-            audit.log_action(
-                admin_id=admin_id,
-                action="no_data_found",
-                details={
-                    "source_type": source,
-                    "query": query
-                },
-                session_id=session_id
-            )
-        except Exception as e:
-            logger.error(f"Error persisting no-data-found event: {e}")
+        # Persist this event for analysis, off the response path - nothing
+        # downstream reads these rows during the turn
+        run_in_background(_persist_no_data, session_id, admin_id, source, query)
         
         # Return user-friendly message
         # Note: With improved intent detection, this should rarely occur for valid CRM queries
@@ -1,12 +1,14 @@
 from typing import Dict, Any, Optional
+from functools import lru_cache
 from app.langgraph.state import AgentState
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from app.core.config import settings
+from app.db.supabase import _proxy_env_stripped
+from app.utils.ttl_cache import TTLCache
 import logging
 import re
 import httpx
-import os
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,12 @@ GREETING_KEYWORDS = [
     "hi there", "hello there", "hey there"
 ]
 
+# Exact greetings resolve with one O(1) hash probe; the prefix case
+# ("hi there everyone") is a single C-level startswith over the tuple.
+# Together these cover the old per-keyword loop exactly.
+_GREETING_SET = frozenset(GREETING_KEYWORDS)
+_GREETING_PREFIXES = tuple(k + " " for k in GREETING_KEYWORDS)
+
 def is_greeting(message: str) -> bool:
     """
     Detects if a message is a greeting.
@@ -26,16 +34,8 @@ def is_greeting(message: str) -> bool:
     """
     if not message:
         return False
-    
-    # Normalize: lowercase, trim whitespace
     normalized = message.strip().lower()
-    
-    # Check exact match or starts with greeting keyword
-    for keyword in GREETING_KEYWORDS:
-        if normalized == keyword or normalized.startswith(keyword + " "):
-            return True
-    
-    return False
+    return normalized in _GREETING_SET or normalized.startswith(_GREETING_PREFIXES)
 
 def get_greeting_response() -> str:
     """
@@ -43,6 +43,12 @@ def get_greeting_response() -> str:
     """
     return "Hii 👋\nWhat's up? How can I help you today?"
 
+# Punctuation stripper (keeps spaces and alphanumerics) and plural
+# normalizer: drop a trailing 's' from words longer than 3 chars (leads ->
+# lead, trainers -> trainer) without touching 'is', 'as', etc.
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_PLURAL_RE = re.compile(r'\b(\w{3,})s\b')
+
 def normalize_input(text: str) -> str:
     """
     Normalizes user input for robust matching.
@@ -53,26 +59,80 @@ def normalize_input(text: str) -> str:
     """
     if not text:
         return ""
-    
-    # Lowercase and trim
-    normalized = text.strip().lower()
-    
-    # Remove punctuation (keep spaces and alphanumeric)
-    normalized = re.sub(r'[^\w\s]', ' ', normalized)
-    
-    # Normalize plural/singular (simple approach)
-    # Remove trailing 's' for common words (leads -> lead, trainers -> trainer)
-    # But keep context-aware (e.g., "courses" -> "course")
-    words = normalized.split()
-    normalized_words = []
-    for word in words:
-        # Remove trailing 's' if word is longer than 3 chars (to avoid removing 'is', 'as', etc.)
-        if len(word) > 3 and word.endswith('s'):
-            normalized_words.append(word[:-1])
-        else:
-            normalized_words.append(word)
-    
-    return ' '.join(normalized_words)
+
+    # Two C-level regex passes replace the old per-word Python loop
+    normalized = _PUNCT_RE.sub(' ', text.lower())
+    normalized = _PLURAL_RE.sub(r'\1', normalized)
+    return ' '.join(normalized.split())
+
+# CRM keywords (comprehensive list)
+_CRM_KEYWORDS = (
+    # Leads
+    'lead', 'leads', 'prospect', 'prospects', 'enquiry', 'inquiry', 'inquiries',
+    'customer lead', 'crm lead', 'crm leads',
+    # Trainers
+    'trainer', 'trainers', 'instructor', 'instructors',
+    # Learners
+    'learner', 'learners', 'student', 'students',
+    # Campaigns
+    'campaign', 'campaigns', 'marketing campaign',
+    # Tasks
+    'task', 'tasks', 'todo', 'todos',
+    # Activities
+    'activity', 'activities', 'log', 'logs',
+    # Notes
+    'note', 'notes', 'comment', 'comments',
+    # Courses (in CRM)
+    'course', 'courses', 'program', 'programs',
+    # Generic CRM
+    'crm', 'crm data', 'crm information'
+)
+
+# LMS keywords
+_LMS_KEYWORDS = (
+    'batch', 'batches', 'training batch', 'lms batch', 'lms batches',
+    'batch schedule', 'batch schedules', 'lms'
+)
+
+# RMS keywords
+_RMS_KEYWORDS = (
+    'candidate', 'candidates', 'recruitment', 'job', 'jobs',
+    'position', 'positions', 'rms', 'rms candidate', 'rms candidates',
+    'job opening', 'job openings', 'opening', 'openings', 'vacancy', 'vacancies',
+    'interview', 'interviews', 'screening', 'screenings',
+    'company', 'companies', 'organization', 'organizations', 'employer', 'employers',
+    'hiring', 'hiring manager', 'recruiter', 'recruiters'
+)
+
+# RAG keywords
+_RAG_KEYWORDS = (
+    'policy', 'policies', 'document', 'documents', 'knowledge base',
+    'knowledge', 'guide', 'guides', 'manual', 'manuals', 'rag'
+)
+
+
+def _alternation(keywords) -> str:
+    """Word alternation for one category, longest keyword first so
+    multi-word entries win over their prefixes."""
+    return '|'.join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+
+
+# All four categories fused into one named-group pattern: a single
+# left-to-right C-level pass finds every keyword occurrence, and the rank
+# table restores the old check order (CRM first, then LMS, RMS, RAG)
+# regardless of where in the message each keyword appears.
+_COMBINED_INTENT_RE = re.compile('|'.join(
+    rf'(?P<{name}>\b(?:{_alternation(keywords)})\b)'
+    for name, keywords in (
+        ("crm", _CRM_KEYWORDS),
+        ("lms", _LMS_KEYWORDS),
+        ("rms", _RMS_KEYWORDS),
+        ("rag", _RAG_KEYWORDS),
+    )
+))
+
+_INTENT_RANK = {"crm": 0, "lms": 1, "rms": 2, "rag": 3}
+
 
 def detect_intent_keywords(query: str) -> Optional[str]:
     """
@@ -81,120 +141,27 @@ def detect_intent_keywords(query: str) -> Optional[str]:
     Returns source type or None if unclear.
     """
     normalized = normalize_input(query)
-    
-    # CRM keywords (comprehensive list)
-    crm_keywords = [
-        # Leads
-        'lead', 'leads', 'prospect', 'prospects', 'enquiry', 'enquiry', 'inquiry', 'inquiries',
-        'customer lead', 'crm lead', 'crm leads',
-        # Trainers
-        'trainer', 'trainers', 'instructor', 'instructors',
-        # Learners
-        'learner', 'learners', 'student', 'students',
-        # Campaigns
-        'campaign', 'campaigns', 'marketing campaign',
-        # Tasks
-        'task', 'tasks', 'todo', 'todos',
-        # Activities
-        'activity', 'activities', 'log', 'logs',
-        # Notes
-        'note', 'notes', 'comment', 'comments',
-        # Courses (in CRM)
-        'course', 'courses', 'program', 'programs',
-        # Generic CRM
-        'crm', 'crm data', 'crm information'
-    ]
-    
-    # LMS keywords
-    lms_keywords = [
-        'batch', 'batches', 'training batch', 'lms batch', 'lms batches',
-        'batch schedule', 'batch schedules', 'lms'
-    ]
-    
-    # RMS keywords
-    rms_keywords = [
-        'candidate', 'candidates', 'recruitment', 'job', 'jobs',
-        'position', 'positions', 'rms', 'rms candidate', 'rms candidates',
-        'job opening', 'job openings', 'opening', 'openings', 'vacancy', 'vacancies',
-        'interview', 'interviews', 'screening', 'screenings',
-        'company', 'companies', 'organization', 'organizations', 'employer', 'employers',
-        'hiring', 'hiring manager', 'recruiter', 'recruiters'
-    ]
-    
-    # RAG keywords
-    rag_keywords = [
-        'policy', 'policies', 'document', 'documents', 'knowledge base',
-        'knowledge', 'guide', 'guides', 'manual', 'manuals', 'rag'
-    ]
-    
-    # Check for CRM keywords (most comprehensive)
-    for keyword in crm_keywords:
-        if re.search(rf'\b{re.escape(keyword)}\b', normalized):
-            logger.info(f"CRM intent detected via keyword: {keyword}")
-            return "crm"
-    
-    # Check for LMS keywords
-    for keyword in lms_keywords:
-        if re.search(rf'\b{re.escape(keyword)}\b', normalized):
-            logger.info(f"LMS intent detected via keyword: {keyword}")
-            return "lms"
-    
-    # Check for RMS keywords
-    for keyword in rms_keywords:
-        if re.search(rf'\b{re.escape(keyword)}\b', normalized):
-            logger.info(f"RMS intent detected via keyword: {keyword}")
-            return "rms"
-    
-    # Check for RAG keywords
-    for keyword in rag_keywords:
-        if re.search(rf'\b{re.escape(keyword)}\b', normalized):
-            logger.info(f"RAG intent detected via keyword: {keyword}")
-            return "rag"
-    
-    return None
 
-def decide_source_node(state: AgentState) -> Dict[str, Any]:
-    """
-    Decides which data source to query based on user_message.
-    Uses LENIENT intent detection: keyword-based first, then LLM fallback.
-    """
-    try:
-        user_message = state["user_message"]
-        
-        # Check for greeting first (no LLM call needed)
-        if is_greeting(user_message):
-            logger.info("Greeting detected, skipping data retrieval")
-            return {
-                "source_type": "none",
-                "response": get_greeting_response()
-            }
-        
-        # STEP 1: Try robust keyword-based intent detection (LENIENT)
-        keyword_intent = detect_intent_keywords(user_message)
-        if keyword_intent:
-            logger.info(f"Intent detected via keywords: {keyword_intent}")
-            return {"source_type": keyword_intent}
-        
-        # STEP 2: Fallback to LLM for ambiguous cases
-        logger.info("No clear keyword match, using LLM for classification")
-        # Remove proxy env vars before creating httpx client to prevent OpenAI from reading them
-        saved_proxy_vars = {}
-        proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-        for var in proxy_vars:
-            if var in os.environ:
-                saved_proxy_vars[var] = os.environ.pop(var)
-        
-        try:
-            http_client = httpx.Client()
-            llm = ChatOpenAI(
-                api_key=settings.OPENAI_API_KEY,
-                model="gpt-4o",
-                http_client=http_client
-            )
-        finally:
-            os.environ.update(saved_proxy_vars)
-        
-        system_prompt = """You are a router. Classify the user's request into the correct data source.
+    best_source = None
+    best_keyword = None
+    best_rank = len(_INTENT_RANK)
+    for match in _COMBINED_INTENT_RE.finditer(normalized):
+        rank = _INTENT_RANK[match.lastgroup]
+        if rank < best_rank:
+            best_source, best_keyword, best_rank = match.lastgroup, match.group(), rank
+            if rank == 0:  # CRM outranks everything; stop scanning
+                break
+
+    if best_source:
+        logger.info("%s intent detected via keyword: %s", best_source.upper(), best_keyword)
+    return best_source
+
+# LLM classification verdicts keyed by the normalized message: rephrasings
+# that normalize the same way skip the ~500ms classifier round trip. The
+# mapping from message to source is stable, so a long TTL is safe.
+_classify_cache = TTLCache(maxsize=4096, ttl=600)
+
+_ROUTER_SYSTEM_PROMPT = """You are a router. Classify the user's request into the correct data source.
 
         IMPORTANT: CRM contains ALL of these entities:
         - Leads, Prospects, Customers
@@ -205,14 +172,14 @@ def decide_source_node(state: AgentState) -> Dict[str, Any]:
         - Activities, Activity logs
         - Notes, Comments
         - Courses (Course table is in CRM, not LMS)
-        
+
         Categories:
         - "crm": All CRM data including Leads, Trainers, Learners, Campaigns, Tasks, Activities, Notes, Courses
         - "lms": Training batches and batch schedules only (NOT trainers or learners - those are in CRM)
         - "rms": Candidate/Job/Recruitment data including Job Openings, Candidates, Companies, Interviews, and RMS Tasks
         - "rag": Policy/Knowledge base/Documents
         - "general": Off-topic or unclear requests
-        
+
         CRITICAL RULES:
         1. Trainers/Instructors → ALWAYS "crm" (NOT "lms")
         2. Learners/Students → ALWAYS "crm" (NOT "lms")
@@ -220,25 +187,86 @@ def decide_source_node(state: AgentState) -> Dict[str, Any]:
         4. Only training batches/schedules → "lms"
         5. Job openings, positions, vacancies, candidates, interviews, companies → "rms"
         6. Tasks in recruitment context → "rms", otherwise "crm"
-        
+
         Return ONLY the category name.
         """
+
+
+@lru_cache(maxsize=1)
+def _get_router_chain():
+    """
+    One classifier chain per process: the httpx client keeps pooled
+    connections alive between requests (HTTP/2 when h2 is installed)
+    instead of paying a TCP/TLS handshake and ChatOpenAI construction on
+    every LLM fallback. Proxy env vars are stripped once, during the
+    single construction, not per call.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    with _proxy_env_stripped():
+        http_client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300),
+        )
+        llm = ChatOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            model="gpt-4o",
+            http_client=http_client
+        )
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", _ROUTER_SYSTEM_PROMPT),
+        ("user", "{input}")
+    ])
+    return prompt | llm
+
+
+def decide_source_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Decides which data source to query based on user_message.
+    Uses LENIENT intent detection: keyword-based first, then LLM fallback.
+    """
+    try:
+        user_message = state["user_message"]
+        
+        # Check for greeting first (no LLM call needed)
+        if is_greeting(user_message):
+            logger.info("Greeting detected, skipping data retrieval")
+            return {
+                "source_type": "none",
+                "response": get_greeting_response()
+            }
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("user", "{input}")
-        ])
+        # STEP 1: Try robust keyword-based intent detection (LENIENT)
+        keyword_intent = detect_intent_keywords(user_message)
+        if keyword_intent:
+            logger.info("Intent detected via keywords: %s", keyword_intent)
+            return {"source_type": keyword_intent}
         
-        chain = prompt | llm
+        # STEP 2: Fallback to LLM for ambiguous cases (cached per
+        # normalized message so repeats skip the round trip)
+        cache_key = normalize_input(user_message)
+        cached_source = _classify_cache.get(cache_key)
+        if cached_source is not None:
+            logger.info("Source classification cache hit: %s", cached_source)
+            return {"source_type": cached_source}
+
+        logger.info("No clear keyword match, using LLM for classification")
+        chain = _get_router_chain()
         result = chain.invoke({"input": user_message})
         source = result.content.strip().lower()
-        
+
         valid_sources = ["crm", "lms", "rms", "rag", "general"]
         if source not in valid_sources:
             source = "general"
-            
-        logger.info(f"Decided source: {source}")
-        
+
+        logger.info("Decided source: %s", source)
+        _classify_cache.set(cache_key, source)
+
         return {"source_type": source}
         
     except Exception as e:
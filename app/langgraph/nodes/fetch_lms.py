@@ -2,11 +2,20 @@ from typing import Dict, Any
 from app.langgraph.state import AgentState
 from app.db.lms_repo import LMSRepo
 from app.db.retrieved_context_repo import RetrievedContextRepo
+from app.utils.background import run_in_background
+from functools import lru_cache
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-def fetch_lms_node(state: AgentState) -> Dict[str, Any]:
+
+@lru_cache(maxsize=1)
+def _get_context_repo() -> RetrievedContextRepo:
+    return RetrievedContextRepo()
+
+async def fetch_lms_node(state: AgentState) -> Dict[str, Any]:
     """
     Fetches LMS data from Supabase and attaches to state.
     Sets source_type to 'lms' and attaches data to retrieved_context.
@@ -16,18 +25,19 @@ def fetch_lms_node(state: AgentState) -> Dict[str, Any]:
     try:
         query = state["user_message"]
         session_id = state["session_id"]
-        logger.info(f"Fetching LMS data for query: {query[:50]}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Fetching LMS data for query: {query[:50]}...")
         
-        import time
         retrieval_start = time.time()
         repo = LMSRepo()
-        data = repo.search_lms(query)
+        data = await asyncio.to_thread(repo.search_lms, query)
         retrieval_time_ms = int((time.time() - retrieval_start) * 1000)
         
-        # Persist retrieved context to database
-        context_repo = RetrievedContextRepo()
+        # Persist retrieved context off the response path - nothing
+        # downstream reads the row during this turn
         admin_id = state.get("admin_id", "anonymous")
-        context_repo.save_context(
+        run_in_background(
+            _get_context_repo().save_context,
             session_id=session_id,
             admin_id=admin_id,
             source_type="lms",
@@ -45,12 +55,12 @@ def fetch_lms_node(state: AgentState) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Error fetching LMS: {e}", exc_info=True)
-        # Persist error context
+        # Persist error context (also off the response path)
         try:
-            context_repo = RetrievedContextRepo()
             admin_id = state.get("admin_id", "anonymous")
             query = state.get("user_message", "")
-            context_repo.save_context(
+            run_in_background(
+                _get_context_repo().save_context,
                 session_id=state.get("session_id", "unknown"),
                 admin_id=admin_id,
                 source_type="lms",
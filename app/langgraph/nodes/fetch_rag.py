@@ -2,11 +2,20 @@ from typing import Dict, Any
 from app.langgraph.state import AgentState
 from app.rag.vector_search import VectorSearch
 from app.db.retrieved_context_repo import RetrievedContextRepo
+from app.utils.background import run_in_background
+from functools import lru_cache
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-def fetch_rag_node(state: AgentState) -> Dict[str, Any]:
+
+@lru_cache(maxsize=1)
+def _get_context_repo() -> RetrievedContextRepo:
+    return RetrievedContextRepo()
+
+async def fetch_rag_node(state: AgentState) -> Dict[str, Any]:
     """
     Fetches RAG data from vector search and attaches to state.
     Persists retrieved data to database.
@@ -16,16 +25,16 @@ def fetch_rag_node(state: AgentState) -> Dict[str, Any]:
         session_id = state["session_id"]
         search_engine = VectorSearch()
         
-        import time
         retrieval_start = time.time()
         # Search for documents
-        documents = search_engine.search(query, limit=3)
+        documents = await asyncio.to_thread(search_engine.search, query, 3)
         retrieval_time_ms = int((time.time() - retrieval_start) * 1000)
         
-        # Persist retrieved context to database
-        context_repo = RetrievedContextRepo()
+        # Persist retrieved context off the response path - nothing
+        # downstream reads the row during this turn
         admin_id = state.get("admin_id", "anonymous")
-        context_repo.save_context(
+        run_in_background(
+            _get_context_repo().save_context,
             session_id=session_id,
             admin_id=admin_id,
             source_type="rag",
@@ -42,12 +51,12 @@ def fetch_rag_node(state: AgentState) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Error fetching RAG: {e}", exc_info=True)
-        # Persist error context
+        # Persist error context (also off the response path)
         try:
-            context_repo = RetrievedContextRepo()
             admin_id = state.get("admin_id", "anonymous")
             query = state.get("user_message", "")
-            context_repo.save_context(
+            run_in_background(
+                _get_context_repo().save_context,
                 session_id=state.get("session_id", "unknown"),
                 admin_id=admin_id,
                 source_type="rag",
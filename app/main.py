@@ -11,9 +11,21 @@ import logging
 logger = logging.getLogger(__name__)
 setup_logging()
 
+# Use orjson for response serialization when available (3-10x faster than the
+# pure-Python json encoder, and it emits bytes directly). Falls back to the
+# default JSONResponse if orjson is not installed.
+try:
+    import orjson  # noqa: F401 - presence check; ORJSONResponse requires it
+    from fastapi.responses import ORJSONResponse
+    _response_class = ORJSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as _response_class
+    logger.debug("orjson not installed - using default JSON serialization")
+
 app = FastAPI(
     title="Edify Admin AI Service Agent",
     version="1.0.0",
+    default_response_class=_response_class,
 )
 
 # Configure CORS (optional: configurable origins)
@@ -34,25 +46,34 @@ app.add_middleware(
 
 # Optional: Add response compression
 if settings.ENABLE_COMPRESSION:
-    from fastapi.middleware.gzip import GZipMiddleware
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
-    logger.info("Response compression enabled")
+    # Prefer brotli for chat text (ratios ~4-6x on history payloads) when
+    # brotli-asgi is installed; it falls back to gzip for clients that don't
+    # advertise br. Otherwise use stdlib gzip. minimum_size skips small
+    # payloads where compression overhead outweighs the savings.
+    try:
+        from brotli_asgi import BrotliMiddleware
+        app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024)
+        logger.info("Response compression enabled (brotli)")
+    except ImportError:
+        from fastapi.middleware.gzip import GZipMiddleware
+        app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+        logger.info("Response compression enabled (gzip)")
 
 # Optional: Add rate limiting (if enabled)
 # Note: Rate limiting is applied via decorators on individual routes
 # Routes will work without rate limiting if slowapi is not installed
 if settings.ENABLE_RATE_LIMITING:
-    try:
-        from slowapi import Limiter, _rate_limit_exceeded_handler
-        from slowapi.util import get_remote_address
+    if chat._limiter is not None:
+        from slowapi import _rate_limit_exceeded_handler
         from slowapi.errors import RateLimitExceeded
-        
-        limiter = Limiter(key_func=get_remote_address)
-        app.state.limiter = limiter
+
+        # Share the Limiter the chat routes were decorated with rather than
+        # constructing a second instance with its own storage.
+        app.state.limiter = chat._limiter
         app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
         logger.info(f"Rate limiting enabled: {settings.RATE_LIMIT_PER_MINUTE}/min, {settings.RATE_LIMIT_PER_HOUR}/hour")
         logger.info("Rate limiting will be applied to routes that use @limiter.limit() decorator")
-    except ImportError:
+    else:
         logger.warning("slowapi not installed - rate limiting disabled. Install with: pip install slowapi")
         settings.ENABLE_RATE_LIMITING = False
 
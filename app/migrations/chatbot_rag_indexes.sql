@@ -0,0 +1,39 @@
+-- ============================================================================
+-- Chatbot RAG Index Migration (OPTIONAL)
+-- ============================================================================
+--
+-- Execute this file in the CHATBOT Supabase project's SQL Editor (the
+-- read/write project that owns rag_documents / rag_embeddings).
+--
+-- document_exists checks for chunks with
+--     file_name LIKE '<file>::chunk_%'
+-- Without an index this is a sequential scan that grows with the corpus.
+-- A text_pattern_ops btree makes left-anchored LIKE patterns index
+-- lookups (O(log N)), with no application change and no feature flag:
+-- the planner simply starts using it.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_rag_documents_file_name_pattern
+    ON rag_documents (file_name text_pattern_ops);
+
+-- ----------------------------------------------------------------------------
+-- Approximate nearest-neighbor index for similarity search
+-- ----------------------------------------------------------------------------
+-- Without a vector index, match_documents scans every row in
+-- rag_embeddings and computes each cosine distance exactly. An HNSW
+-- index answers top-k in roughly logarithmic time with near-exact
+-- recall, and the planner uses it automatically for the <=> operator -
+-- no application change. Build time and memory scale with corpus size;
+-- for a few thousand chunks both are negligible.
+--
+-- The operator class must match the distance used by match_documents
+-- (vector_cosine_ops for cosine similarity).
+
+CREATE INDEX IF NOT EXISTS idx_rag_embeddings_embedding_hnsw
+    ON rag_embeddings
+    USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 200);
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
@@ -0,0 +1,66 @@
+-- ============================================================================
+-- Chatbot RAG Ingestion RPC Migration (OPTIONAL)
+-- ============================================================================
+--
+-- Execute this file in the CHATBOT Supabase project's SQL Editor (the
+-- read/write project that owns rag_documents / rag_embeddings). The
+-- two-table design forces the client to insert document rows, read back
+-- their ids, then insert the embeddings - two dependent requests even when
+-- batched. This function does both inserts in one server-side transaction,
+-- so a whole PDF ingests in a single REST call and a mid-ingest failure
+-- rolls back cleanly instead of leaving documents without embeddings.
+--
+-- After applying, set ENABLE_RAG_RPC=true in the chatbot environment.
+-- Without this migration (or with the flag off), ingestion keeps using the
+-- batched two-step inserts and nothing changes.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION create_rag_chunks(payload jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    item jsonb;
+    doc_id uuid;
+    inserted integer := 0;
+BEGIN
+    FOR item IN SELECT * FROM jsonb_array_elements(payload) LOOP
+        INSERT INTO rag_documents (file_name, content, token_count)
+        VALUES (
+            item->>'file_name',
+            item->>'content',
+            NULLIF(item->>'token_count', '')::integer
+        )
+        RETURNING id INTO doc_id;
+
+        INSERT INTO rag_embeddings (document_id, embedding)
+        VALUES (doc_id, (item->>'embedding')::vector);
+
+        inserted := inserted + 1;
+    END LOOP;
+
+    RETURN inserted;
+END;
+$$;
+
+-- ----------------------------------------------------------------------------
+-- Boolean existence check for ingested files
+-- ----------------------------------------------------------------------------
+-- document_exists otherwise selects an id row and checks the row count;
+-- EXISTS lets the planner stop at the first matching chunk and the wire
+-- payload shrinks to a single boolean.
+
+CREATE OR REPLACE FUNCTION rag_document_exists(name text)
+RETURNS boolean
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT EXISTS (
+        SELECT 1 FROM rag_documents
+        WHERE file_name LIKE name || '::chunk_%'
+    );
+$$;
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
@@ -0,0 +1,76 @@
+-- ============================================================================
+-- Edify CRM Full-Text Search Migration (OPTIONAL)
+-- ============================================================================
+--
+-- Execute this file in the EDIFY Supabase project's SQL Editor (not the
+-- Chatbot project). It adds a generated tsvector column plus a GIN index to
+-- each CRM table searched by the chatbot, so text search becomes an index
+-- scan instead of a multi-field ILIKE '%...%' sequential scan.
+--
+-- After applying, set ENABLE_CRM_FTS=true in the chatbot environment.
+-- Without this migration (or with the flag off), the chatbot keeps using
+-- the ILIKE fallback and nothing changes.
+-- ============================================================================
+
+-- campaigns
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(name, '') || ' ' || coalesce(status, '') || ' ' ||
+        coalesce(type, '') || ' ' || coalesce(campaign_owner, '') || ' ' ||
+        coalesce(phone, ''))) STORED;
+CREATE INDEX IF NOT EXISTS campaigns_tsv_idx ON campaigns USING GIN(tsv);
+
+-- leads
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(name, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(phone, '') || ' ' || coalesce(lead_status, '') || ' ' ||
+        coalesce(course_list, '') || ' ' || coalesce(lead_source, '') || ' ' ||
+        coalesce(lead_owner, ''))) STORED;
+CREATE INDEX IF NOT EXISTS leads_tsv_idx ON leads USING GIN(tsv);
+
+-- tasks
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(subject, '') || ' ' || coalesce(priority, '') || ' ' ||
+        coalesce(status, '') || ' ' || coalesce(task_type, ''))) STORED;
+CREATE INDEX IF NOT EXISTS tasks_tsv_idx ON tasks USING GIN(tsv);
+
+-- trainers
+ALTER TABLE trainers ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(trainer_name, '') || ' ' || coalesce(trainer_status, '') || ' ' ||
+        coalesce(tech_stack, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(phone, '') || ' ' || coalesce(location, ''))) STORED;
+CREATE INDEX IF NOT EXISTS trainers_tsv_idx ON trainers USING GIN(tsv);
+
+-- learners
+ALTER TABLE learners ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(name, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(phone, '') || ' ' || coalesce(status, '') || ' ' ||
+        coalesce(course, '') || ' ' || coalesce(location, ''))) STORED;
+CREATE INDEX IF NOT EXISTS learners_tsv_idx ON learners USING GIN(tsv);
+
+-- Course (capital C as per schema)
+ALTER TABLE "Course" ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(title, '') || ' ' || coalesce(description, '') || ' ' ||
+        coalesce(trainer, '') || ' ' || coalesce(duration, ''))) STORED;
+CREATE INDEX IF NOT EXISTS course_tsv_idx ON "Course" USING GIN(tsv);
+
+-- activity
+ALTER TABLE activity ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(activity_name, ''))) STORED;
+CREATE INDEX IF NOT EXISTS activity_tsv_idx ON activity USING GIN(tsv);
+
+-- notes
+ALTER TABLE notes ADD COLUMN IF NOT EXISTS tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple',
+        coalesce(content, ''))) STORED;
+CREATE INDEX IF NOT EXISTS notes_tsv_idx ON notes USING GIN(tsv);
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
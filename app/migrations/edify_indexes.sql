@@ -0,0 +1,26 @@
+-- ============================================================================
+-- Edify CRM Date Index Migration (OPTIONAL)
+-- ============================================================================
+--
+-- Execute this file in the EDIFY Supabase project's SQL Editor (not the
+-- Chatbot project). The chatbot's hottest CRM queries are date-bounded
+-- ("today", "yesterday", "this week", "new" = last 7 days) and always order
+-- by the created date descending. A descending btree index per table turns
+-- those from full-table scans into index range scans and serves the
+-- ORDER BY ... DESC LIMIT n pattern directly.
+--
+-- No application flag is needed; Postgres picks the indexes up on its own.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS campaigns_created_at_idx ON campaigns (created_at DESC);
+CREATE INDEX IF NOT EXISTS leads_created_at_idx ON leads (created_at DESC);
+CREATE INDEX IF NOT EXISTS tasks_created_at_idx ON tasks (created_at DESC);
+CREATE INDEX IF NOT EXISTS trainers_created_at_idx ON trainers (created_at DESC);
+CREATE INDEX IF NOT EXISTS learners_created_at_idx ON learners (created_at DESC);
+CREATE INDEX IF NOT EXISTS course_created_at_idx ON "Course" ("createdAt" DESC);
+CREATE INDEX IF NOT EXISTS activity_created_at_idx ON activity (created_at DESC);
+CREATE INDEX IF NOT EXISTS notes_created_at_idx ON notes (created_at DESC);
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
@@ -0,0 +1,128 @@
+-- ============================================================================
+-- Edify CRM Trigram Search Migration (OPTIONAL)
+-- ============================================================================
+--
+-- Execute this file in the EDIFY Supabase project's SQL Editor (not the
+-- Chatbot project). Unlike the tsvector migration (edify_fts.sql), trigram
+-- indexes accelerate substring matches - phones, emails, partial names -
+-- where word-based full-text search does not help. With pg_trgm installed,
+-- ILIKE '%...%' against the generated search_blob column becomes an index
+-- scan instead of a per-row sequential scan.
+--
+-- After applying, set ENABLE_CRM_TRGM=true in the chatbot environment.
+-- Without this migration (or with the flag off), the chatbot keeps using
+-- the per-field ILIKE fallback and nothing changes.
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- campaigns
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(name, '') || ' ' || coalesce(status, '') || ' ' ||
+        coalesce(type, '') || ' ' || coalesce(campaign_owner, '') || ' ' ||
+        coalesce(phone, '')) STORED;
+CREATE INDEX IF NOT EXISTS campaigns_search_trgm ON campaigns USING gin (search_blob gin_trgm_ops);
+
+-- leads
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(name, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(phone, '') || ' ' || coalesce(lead_status, '') || ' ' ||
+        coalesce(course_list, '') || ' ' || coalesce(lead_source, '') || ' ' ||
+        coalesce(lead_owner, '')) STORED;
+CREATE INDEX IF NOT EXISTS leads_search_trgm ON leads USING gin (search_blob gin_trgm_ops);
+
+-- tasks
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(subject, '') || ' ' || coalesce(priority, '') || ' ' ||
+        coalesce(status, '') || ' ' || coalesce(task_type, '')) STORED;
+CREATE INDEX IF NOT EXISTS tasks_search_trgm ON tasks USING gin (search_blob gin_trgm_ops);
+
+-- trainers
+ALTER TABLE trainers ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(trainer_name, '') || ' ' || coalesce(trainer_status, '') || ' ' ||
+        coalesce(tech_stack, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(phone, '') || ' ' || coalesce(location, '')) STORED;
+CREATE INDEX IF NOT EXISTS trainers_search_trgm ON trainers USING gin (search_blob gin_trgm_ops);
+
+-- learners
+ALTER TABLE learners ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(name, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(phone, '') || ' ' || coalesce(status, '') || ' ' ||
+        coalesce(course, '') || ' ' || coalesce(location, '')) STORED;
+CREATE INDEX IF NOT EXISTS learners_search_trgm ON learners USING gin (search_blob gin_trgm_ops);
+
+-- Course (capital C as per schema)
+ALTER TABLE "Course" ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(title, '') || ' ' || coalesce(description, '') || ' ' ||
+        coalesce(trainer, '') || ' ' || coalesce(duration, '')) STORED;
+CREATE INDEX IF NOT EXISTS course_search_trgm ON "Course" USING gin (search_blob gin_trgm_ops);
+
+-- activity
+ALTER TABLE activity ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (coalesce(activity_name, '')) STORED;
+CREATE INDEX IF NOT EXISTS activity_search_trgm ON activity USING gin (search_blob gin_trgm_ops);
+
+-- notes
+ALTER TABLE notes ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (coalesce(content, '')) STORED;
+CREATE INDEX IF NOT EXISTS notes_search_trgm ON notes USING gin (search_blob gin_trgm_ops);
+
+-- lms_batches (LMS search; gate with ENABLE_LMS_TRGM)
+ALTER TABLE lms_batches ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(name, '') || ' ' || coalesce(title, '') || ' ' ||
+        coalesce(description, '') || ' ' || coalesce(instructor, '') || ' ' ||
+        coalesce(course_name, '')) STORED;
+CREATE INDEX IF NOT EXISTS lms_batches_search_trgm ON lms_batches USING gin (search_blob gin_trgm_ops);
+
+-- RMS tables (gate with ENABLE_RMS_TRGM; tasks is shared with CRM and
+-- already covered above)
+
+-- job_openings
+ALTER TABLE job_openings ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(job_title, '') || ' ' || coalesce(job_type, '') || ' ' ||
+        coalesce(industry, '') || ' ' || coalesce(department, '') || ' ' ||
+        coalesce(city, '') || ' ' || coalesce(country, '') || ' ' ||
+        coalesce(state, '') || ' ' || coalesce(job_status, '') || ' ' ||
+        coalesce(location, '')) STORED;
+CREATE INDEX IF NOT EXISTS job_openings_search_trgm ON job_openings USING gin (search_blob gin_trgm_ops);
+
+-- candidates
+ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(candidate_name, '') || ' ' || coalesce(job_title, '') || ' ' ||
+        coalesce(industry, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(mobile, '') || ' ' || coalesce(department_name, '') || ' ' ||
+        coalesce(city, '') || ' ' || coalesce(country, '') || ' ' ||
+        coalesce(state, '') || ' ' || coalesce(candidate_status, '') || ' ' ||
+        coalesce(current_job_title, '')) STORED;
+CREATE INDEX IF NOT EXISTS candidates_search_trgm ON candidates USING gin (search_blob gin_trgm_ops);
+
+-- companies
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(company_name, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(phone, '') || ' ' || coalesce(city, '') || ' ' ||
+        coalesce(country, '') || ' ' || coalesce(state, '') || ' ' ||
+        coalesce(status, '') || ' ' || coalesce(vendor_name, '')) STORED;
+CREATE INDEX IF NOT EXISTS companies_search_trgm ON companies USING gin (search_blob gin_trgm_ops);
+
+-- interviews
+ALTER TABLE interviews ADD COLUMN IF NOT EXISTS search_blob text
+    GENERATED ALWAYS AS (
+        coalesce(job_title, '') || ' ' || coalesce(interview_name, '') || ' ' ||
+        coalesce(interview_type, '') || ' ' || coalesce(interview_owner, '') || ' ' ||
+        coalesce(location, '') || ' ' || coalesce(status, '') || ' ' ||
+        coalesce(interview_status, '')) STORED;
+CREATE INDEX IF NOT EXISTS interviews_search_trgm ON interviews USING gin (search_blob gin_trgm_ops);
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
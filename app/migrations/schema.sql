@@ -183,6 +183,55 @@ CREATE INDEX idx_chat_history_created_at ON chat_history(created_at DESC);
 CREATE INDEX idx_chat_history_session_created ON chat_history(session_id, created_at DESC);
 
 
+-- ============================================================================
+-- STEP 8: Create RPC Functions for Batched Writes
+-- ============================================================================
+
+-- RPC Function: record_chat_turn
+-- Inserts the chat_history pair and its chat_completed audit entry in one
+-- transaction, so the chat service pays a single network round-trip per turn
+-- instead of two sequential inserts.
+CREATE OR REPLACE FUNCTION record_chat_turn(
+    p_session_id UUID,
+    p_admin_id UUID,
+    p_user_message TEXT,
+    p_assistant_response TEXT,
+    p_source_type TEXT DEFAULT NULL,
+    p_response_time_ms INTEGER DEFAULT NULL,
+    p_tokens_used INTEGER DEFAULT NULL
+)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_chat_id BIGINT;
+BEGIN
+    INSERT INTO chat_history (
+        session_id, admin_id, user_message, assistant_response,
+        source_type, response_time_ms, tokens_used
+    )
+    VALUES (
+        p_session_id, p_admin_id, p_user_message, p_assistant_response,
+        p_source_type, p_response_time_ms, p_tokens_used
+    )
+    RETURNING id INTO v_chat_id;
+
+    INSERT INTO audit_logs (admin_id, session_id, action, metadata)
+    VALUES (
+        p_admin_id,
+        p_session_id,
+        'chat_completed',
+        jsonb_build_object(
+            'source_type', p_source_type,
+            'response_time_ms', p_response_time_ms,
+            'response_length', length(p_assistant_response)
+        )
+    );
+
+    RETURN v_chat_id;
+END;
+$$;
+
 -- ============================================================================
 -- Schema Creation Complete
 -- ============================================================================
@@ -1,17 +1,22 @@
-from typing import List
+from typing import List, Optional
 from langchain_openai import OpenAIEmbeddings
 from app.core.config import settings
+from app.utils.embedding_cache import EmbeddingCache
 import logging
 
 logger = logging.getLogger(__name__)
 
 class Embedder:
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None):
         # Using text-embedding-3-small or ada-002
+        self.model = "text-embedding-3-small"
         self.client = OpenAIEmbeddings(
             api_key=settings.OPENAI_API_KEY,
-            model="text-embedding-3-small" 
+            model=self.model
         )
+        # Optional disk cache for ingestion runs; the request path never
+        # sets a path, so nothing is opened there
+        self._cache = EmbeddingCache(cache_path, self.model) if cache_path else None
 
     def embed_text(self, text: str) -> List[float]:
         """
@@ -26,9 +31,26 @@ class Embedder:
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         Generates embeddings for a list of strings.
+        With a disk cache configured, only texts not embedded before are
+        sent to the API; cached vectors are reused.
         """
         try:
-            return self.client.embed_documents(texts)
+            if self._cache is None:
+                return self.client.embed_documents(texts)
+
+            cached = self._cache.get_many(texts)
+            missing = [text for text in texts if text not in cached]
+            if missing:
+                fresh = self.client.embed_documents(missing)
+                self._cache.put_many(zip(missing, fresh))
+                cached.update(zip(missing, fresh))
+            if cached and not missing:
+                logger.info(f"All {len(texts)} embeddings served from disk cache")
+            elif texts and missing and len(missing) < len(texts):
+                logger.info(
+                    f"Embedded {len(missing)} new chunks, reused {len(texts) - len(missing)} cached"
+                )
+            return [cached[text] for text in texts]
         except Exception as e:
             logger.error(f"Error generating document embeddings: {e}")
             raise e
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any
 from app.db.supabase import get_chatbot_supabase_client
 from app.rag.embedder import Embedder
+from app.utils.semantic_cache import rag_query_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,9 +31,24 @@ class VectorSearch:
             List of document content strings
         """
         try:
+            # 0. Same question asked verbatim recently: answer from cache
+            # before spending the embedding call
+            cached = rag_query_cache.get_exact(query)
+            if cached is not None:
+                logger.debug("Semantic cache hit (exact) for query")
+                return cached
+
             # 1. Embed query
             query_embedding = self.embedder.embed_text(query)
-            
+
+            # 1b. Near-duplicate of a recent question (cosine similarity):
+            # reuse its results instead of searching again
+            cached = rag_query_cache.get_similar(query_embedding)
+            if cached is not None:
+                logger.debug("Semantic cache hit (similar) for query")
+                rag_query_cache.put(query, query_embedding, cached)
+                return cached
+
             # 2. Call RPC function for vector similarity search
             # The RPC function should:
             # - Search rag_embeddings table using cosine similarity
@@ -55,8 +71,9 @@ class VectorSearch:
             # Extract content from results
             # RPC should return: [{content: str, similarity: float}, ...]
             results = [item["content"] for item in response.data if item.get("content")]
-            
+
             logger.info(f"Found {len(results)} matching documents for query")
+            rag_query_cache.put(query, query_embedding, results)
             return results
             
         except Exception as e:
@@ -4,6 +4,7 @@ from app.db.audit_repo import AuditRepo
 from app.db.chat_history_repo import ChatHistoryRepo
 from app.services.session_service import SessionService
 from app.core.config import settings
+from app.utils.background import fire_and_forget
 from typing import Dict, Any, List
 import logging
 import time
@@ -42,13 +43,13 @@ class ChatService:
             # 1. Update session last_activity
             self.session_service.update_last_activity(session_id)
             
-            # 2. Audit log user query
-            self.audit_repo.log_action(
+            # 2. Audit log user query (fire-and-forget - not needed for the response)
+            fire_and_forget(self.audit_repo.log_action_async(
                 admin_id=admin_id,
                 action="user_message_received",
                 details={"message_length": len(user_message)},
                 session_id=session_id
-            )
+            ))
             
             # 3. Load History (from chat_history table)
             history = self.memory_repo.get_chat_history(session_id, limit=5)
@@ -85,24 +86,80 @@ class ChatService:
             # 8. Calculate response time
             response_time_ms = int((time.time() - start_time) * 1000)
             
-            # 9. Save to chat_history table (user message + assistant response pair)
-            # This saves the complete conversation pair for historical tracking
+            # 9. Persist the turn (chat_history pair + chat_completed audit)
+            # as a detached task - the response does not depend on it, so the
+            # client does not pay the DB round-trip.
+            fire_and_forget(self._persist_turn(
+                session_id=session_id,
+                admin_id=admin_id,
+                user_message=user_message,
+                bot_response=bot_response,
+                source_type=source_type,
+                response_time_ms=response_time_ms
+            ))
+
+            return bot_response
+
+        except Exception as e:
+            logger.error(f"Error in ChatService: {e}", exc_info=True)
+            # Audit log the error
             try:
-                chat_history_success = self.chat_history_repo.save_chat_history(
+                await self.audit_repo.log_action_async(
+                    admin_id=admin_id,
+                    action="chat_error",
+                    details={"error": str(e), "user_message": user_message[:100]},
+                    session_id=session_id
+                )
+            except:
+                pass
+            raise e
+
+    async def _persist_turn(
+        self,
+        session_id: str,
+        admin_id: str,
+        user_message: str,
+        bot_response: str,
+        source_type: str,
+        response_time_ms: int
+    ) -> None:
+        """
+        Persists a completed turn: chat_history pair + chat_completed audit.
+        The record_chat_turn RPC does both inserts in one transaction (single
+        round-trip); if it is unavailable we fall back to the separate
+        chat_history and audit_logs writes. Runs detached from the request.
+        """
+        try:
+            turn_recorded = await self.chat_history_repo.record_chat_turn_async(
+                session_id=session_id,
+                admin_id=admin_id,
+                user_message=user_message,
+                assistant_response=bot_response,
+                source_type=source_type,
+                response_time_ms=response_time_ms,
+                tokens_used=None  # Can be added later if token counting is implemented
+            )
+
+            if turn_recorded:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Successfully saved chat history for session {session_id[:8]}...")
+            else:
+                chat_history_success = await self.chat_history_repo.save_chat_history_async(
                     session_id=session_id,
                     admin_id=admin_id,
                     user_message=user_message,
                     assistant_response=bot_response,
                     source_type=source_type,
                     response_time_ms=response_time_ms,
-                    tokens_used=None  # Can be added later if token counting is implemented
+                    tokens_used=None
                 )
-                
+
                 if chat_history_success:
-                    logger.info(f"Successfully saved chat history for session {session_id[:8]}...")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Successfully saved chat history for session {session_id[:8]}...")
                 else:
                     logger.warning(f"Failed to save chat history for session {session_id[:8]}...")
-                    self.audit_repo.log_action(
+                    await self.audit_repo.log_action_async(
                         admin_id=admin_id,
                         action="chat_history_save_failed",
                         details={
@@ -113,43 +170,27 @@ class ChatService:
                         },
                         session_id=session_id
                     )
-            except Exception as chat_history_error:
-                logger.error(f"Exception while saving chat history: {chat_history_error}", exc_info=True)
-                self.audit_repo.log_action(
+
+                # Audit log completion (handled inside the RPC when it succeeds)
+                await self.audit_repo.log_action_async(
                     admin_id=admin_id,
-                    action="chat_history_save_exception",
+                    action="chat_completed",
                     details={
-                        "error": str(chat_history_error),
-                        "session_id": session_id
+                        "source_type": source_type,
+                        "response_time_ms": response_time_ms,
+                        "response_length": len(bot_response)
                     },
                     session_id=session_id
                 )
-            
-            # 10. Audit log completion
-            self.audit_repo.log_action(
+        except Exception as chat_history_error:
+            logger.error(f"Exception while saving chat history: {chat_history_error}", exc_info=True)
+            await self.audit_repo.log_action_async(
                 admin_id=admin_id,
-                action="chat_completed",
+                action="chat_history_save_exception",
                 details={
-                    "source_type": source_type,
-                    "response_time_ms": response_time_ms,
-                    "response_length": len(bot_response)
+                    "error": str(chat_history_error),
+                    "session_id": session_id
                 },
                 session_id=session_id
             )
-            
-            return bot_response
-
-        except Exception as e:
-            logger.error(f"Error in ChatService: {e}", exc_info=True)
-            # Audit log the error
-            try:
-                self.audit_repo.log_action(
-                    admin_id=admin_id,
-                    action="chat_error",
-                    details={"error": str(e), "user_message": user_message[:100]},
-                    session_id=session_id
-                )
-            except:
-                pass
-            raise e
 
@@ -1,4 +1,5 @@
 from app.db.supabase import get_chatbot_supabase_client
+from app.db._uuid import normalize_admin_id
 from typing import Dict, Any, Optional
 import uuid
 from datetime import datetime
@@ -20,18 +21,7 @@ class SessionService:
             session_id = str(uuid.uuid4())
             now = datetime.utcnow().isoformat()
             
-            # Convert admin_id to UUID if it's not already
-            # Handle "anonymous" or other string IDs
-            if admin_id == "anonymous" or not admin_id:
-                # Use a fixed UUID for anonymous users
-                admin_uuid = "00000000-0000-0000-0000-000000000000"
-            else:
-                try:
-                    # Try to parse as UUID
-                    admin_uuid = str(uuid.UUID(admin_id))
-                except ValueError:
-                    # If not a valid UUID, use anonymous UUID
-                    admin_uuid = "00000000-0000-0000-0000-000000000000"
+            admin_uuid = normalize_admin_id(admin_id)
             
             data = {
                 "session_id": session_id,
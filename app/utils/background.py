@@ -0,0 +1,63 @@
+"""
+Bounded fire-and-forget execution for persistence writes.
+
+Audit logs and chat-history rows are not needed to build the assistant
+response, so awaiting them inline adds one DB round-trip of client-visible
+latency per turn. fire_and_forget detaches those writes onto the running
+event loop while a semaphore enforces backpressure: a burst of turns cannot
+pile up an unbounded number of in-flight writes.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Coroutine, Set
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of detached writes in flight at once
+_MAX_CONCURRENT_WRITES = 16
+
+_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_WRITES)
+
+# Strong references so pending tasks are not garbage-collected mid-flight
+_pending: Set[asyncio.Task] = set()
+
+
+def fire_and_forget(coro: Coroutine) -> None:
+    """
+    Schedules a coroutine on the running loop without awaiting its result.
+    Exceptions are logged and swallowed - callers use this for writes whose
+    failure must not affect the response (audit/history persistence).
+    """
+    async def _run():
+        try:
+            async with _semaphore:
+                await coro
+        except Exception as e:
+            logger.error(f"Background write failed: {e}")
+
+    task = asyncio.create_task(_run())
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+# Thread counterpart of fire_and_forget for sync code paths. LangGraph
+# runs sync nodes on executor threads with no event loop, so detached
+# writes from those nodes go to a single worker thread instead; one
+# worker keeps writes ordered and naturally bounds in-flight work.
+_write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bg-write")
+
+
+def run_in_background(fn: Callable, *args, **kwargs) -> None:
+    """
+    Runs a sync callable on the background write thread without waiting
+    for the result. Exceptions are logged and swallowed, as with
+    fire_and_forget.
+    """
+    def _run():
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background write failed: {e}")
+
+    _write_pool.submit(_run)
@@ -111,6 +111,17 @@ def cache_key_chat_history(session_id: str) -> str:
     """Generate cache key for chat history."""
     return f"chat_history:{session_id}"
 
+def cache_key_chat_rows(session_id: str) -> str:
+    """Generate cache key for raw chat_history rows (ChatHistoryRepo)."""
+    return f"chat_rows:{session_id}"
+
+def cache_key_crm_results(table: str, filters: Any, limit: int) -> str:
+    """Generate cache key for executed CRM table queries (CRMRepo._build_query)."""
+    import hashlib
+    filters_repr = json.dumps(filters, sort_keys=True, default=str)
+    digest = hashlib.blake2b(f"{filters_repr}:{limit}".encode(), digest_size=16).hexdigest()
+    return f"crm_results:{table}:{digest}"
+
 def cache_key_crm_query(query: str, table: str) -> str:
     """Generate cache key for CRM query."""
     import hashlib
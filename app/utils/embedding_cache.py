@@ -0,0 +1,78 @@
+"""
+Disk-backed cache for OpenAI embeddings, used at ingestion time.
+
+Re-running the PDF ingestion script re-embeds every chunk whose document
+check misses (renamed files, cleared tables, partial failures), paying
+the embedding API again for content that has not changed. This cache
+keys each chunk by SHA-256 of (model, text) and stores the vector in a
+local SQLite file, so re-ingests only pay for genuinely new text.
+
+SQLite in WAL mode is plenty here: one writer (the script), batch
+lookups, a few thousand rows. Vectors are stored as packed float32
+(array('f')), about half the size of their JSON text form. Not intended
+for the serverless request path - the Embedder only opens it when given
+an explicit cache path.
+"""
+import hashlib
+import sqlite3
+from array import array
+from threading import Lock
+from typing import Dict, Iterable, List, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    hash BLOB PRIMARY KEY,
+    embedding BLOB NOT NULL
+)
+"""
+
+
+class EmbeddingCache:
+    """SQLite-backed text -> embedding cache keyed by (model, text)."""
+
+    def __init__(self, path: str, model: str):
+        self.model = model
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256((self.model + "\0" + text).encode("utf-8")).digest()
+
+    def get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+        """Returns {text: embedding} for every cached text in the input."""
+        keys = {self._key(text): text for text in texts}
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT hash, embedding FROM embeddings WHERE hash IN ({placeholders})",
+                list(keys),
+            ).fetchall()
+        found = {}
+        for key, blob in rows:
+            vector = array("f")
+            vector.frombytes(blob)
+            found[keys[key]] = list(vector)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]]) -> None:
+        """Stores (text, embedding) pairs; existing entries are replaced."""
+        rows = [
+            (self._key(text), array("f", embedding).tobytes())
+            for text, embedding in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, embedding) VALUES (?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
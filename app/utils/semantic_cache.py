@@ -0,0 +1,127 @@
+"""
+Small in-process semantic cache for RAG retrievals.
+
+Chat traffic is FAQ-shaped: the same questions come back, often with only
+cosmetic rewording. This cache answers repeats without the embedding call
+or the vector search. Two layers:
+
+- an exact layer keyed on the normalized query text (always available),
+  hit before the query is even embedded;
+- a similarity layer over the cached query embeddings (cosine >= threshold
+  counts as the same question), hit after embedding but before the vector
+  search. This layer needs numpy for the dot products and quietly stays
+  off when numpy is not installed, matching how the other optional
+  dependencies are handled.
+
+Process-local by design, like TTLCache: each warm instance keeps its own
+copy and falls back to the real search on miss or expiry.
+"""
+import time
+from threading import Lock
+from typing import Any, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SemanticCache:
+    """Query-result cache with exact-text and cosine-similarity lookup."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0, threshold: float = 0.95):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._lock = Lock()
+        # normalized text -> (expires_at, payload)
+        self._exact = {}
+        # parallel lists: embeddings (unit-normalized np arrays) and payloads
+        self._vectors = []
+        self._payloads = []
+        self._expiries = []
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def get_exact(self, text: str) -> Optional[Any]:
+        """Returns the payload for an identical (normalized) query, or None."""
+        key = self._normalize(text)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._exact[key]
+                return None
+            return payload
+
+    def get_similar(self, embedding: List[float]) -> Optional[Any]:
+        """
+        Returns the payload of the most similar cached query if its cosine
+        similarity clears the threshold; None otherwise (or without numpy).
+        """
+        if np is None:
+            return None
+        with self._lock:
+            self._evict_expired()
+            if not self._vectors:
+                return None
+            query = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm == 0.0:
+                return None
+            # Cached vectors are unit-normalized, so one matrix-vector
+            # product yields every cosine at once.
+            sims = np.stack(self._vectors) @ (query / norm)
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                return self._payloads[best]
+            return None
+
+    def put(self, text: str, embedding: Optional[List[float]], payload: Any) -> None:
+        """Stores a query's payload under both layers (embedding optional)."""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            if len(self._exact) >= self.maxsize:
+                # Insertion order approximates oldest-first, as in TTLCache
+                for stale_key in list(self._exact)[: max(1, self.maxsize // 10)]:
+                    del self._exact[stale_key]
+            self._exact[self._normalize(text)] = (expires_at, payload)
+
+            if np is not None and embedding is not None:
+                vector = np.asarray(embedding, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                if norm > 0.0:
+                    if len(self._vectors) >= self.maxsize:
+                        drop = max(1, self.maxsize // 10)
+                        del self._vectors[:drop]
+                        del self._payloads[:drop]
+                        del self._expiries[:drop]
+                    self._vectors.append(vector / norm)
+                    self._payloads.append(payload)
+                    self._expiries.append(expires_at)
+
+    def clear(self) -> None:
+        """Drops everything (called after new documents are ingested)."""
+        with self._lock:
+            self._exact.clear()
+            self._vectors.clear()
+            self._payloads.clear()
+            self._expiries.clear()
+
+    def _evict_expired(self) -> None:
+        """Removes expired similarity entries. Caller holds the lock."""
+        now = time.monotonic()
+        while self._expiries and self._expiries[0] < now:
+            del self._vectors[0]
+            del self._payloads[0]
+            del self._expiries[0]
+
+
+# Shared instance for RAG query results: VectorSearch reads through it and
+# RAGRepo clears it when new documents land, so stale answers don't outlive
+# an ingest within the same process.
+rag_query_cache = SemanticCache()
@@ -0,0 +1,48 @@
+"""
+Small in-process TTL cache.
+
+Used for hot lookups (e.g. session records) where a short staleness window
+is acceptable. Process-local by design: each warm serverless instance keeps
+its own copy and falls back to the database on miss or expiry, so no
+external cache infrastructure is required.
+"""
+import time
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+
+class TTLCache:
+    """Dict-backed cache with per-entry expiry and a bounded size."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Returns the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Stores a value, evicting the oldest entries when full."""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Dicts preserve insertion order, so the front entries are the
+                # oldest writes - drop a batch to avoid evicting one-by-one.
+                for stale_key in list(self._data)[: max(1, self.maxsize // 10)]:
+                    del self._data[stale_key]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def delete(self, key: Any) -> None:
+        """Removes a key if present (used for explicit invalidation)."""
+        with self._lock:
+            self._data.pop(key, None)
@@ -151,9 +151,10 @@ class PDFIngestionService:
     
     def __init__(self):
         self.rag_repo = RAGRepo()
-        self.embedder = Embedder()
-        self.processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
         self.scripts_dir = Path(__file__).parent
+        # Disk cache so re-running the script only embeds new/changed chunks
+        self.embedder = Embedder(cache_path=str(self.scripts_dir / ".embedding_cache.sqlite3"))
+        self.processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
     
     def find_pdf_files(self) -> List[Path]:
         """
@@ -251,12 +252,20 @@ class PDFIngestionService:
             logger.info("💡 Place PDF files in the scripts/ folder and run again")
             return
         
+        # One batch query up front instead of a document_exists round-trip
+        # per already-ingested file
+        new_names = set(self.rag_repo.filter_new_files([p.name for p in pdf_files]))
+
         # Process each PDF
         success_count = 0
         skip_count = 0
         error_count = 0
-        
+
         for pdf_path in pdf_files:
+            if pdf_path.name not in new_names:
+                logger.info(f"⏭️  Skipping {pdf_path.name} - already processed")
+                skip_count += 1
+                continue
             try:
                 if self.process_pdf(pdf_path):
                     success_count += 1